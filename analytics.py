@@ -0,0 +1,312 @@
+"""
+analytics.py:
+Contains the CorrelationSummary dataclass and the functions used to measure how strongly two
+yearly data series are correlated, such as the number of wildfires and carbon dioxide emissions.
+
+CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+import numpy
+
+# The default number of resamples used to compute bootstrap confidence intervals.
+_BOOTSTRAP_SAMPLES: int = 2000
+
+# The seed of the random resamples, so that the same series always get the same intervals.
+_BOOTSTRAP_SEED: int = 110
+
+# The fewest points that a correlation is computed from. Correlations of fewer points are nan.
+_MIN_POINTS: int = 3
+
+
+@dataclass
+class CorrelationSummary:
+    """The correlation statistics of two data series, over the x values they have in common.
+
+    Instance Attributes:
+        - points: The number of x values the two series have in common.
+        - pearson: The Pearson correlation coefficient of the two series.
+        - pearson_interval: The (low, high) 95% bootstrap confidence interval of pearson.
+        - spearman: The Spearman rank correlation coefficient of the two series.
+        - spearman_interval: The (low, high) 95% bootstrap confidence interval of spearman.
+        - best_lag: The lag, in steps of x, at which the lagged correlation of the two series
+            is strongest. See lagged_correlation.
+        - best_lag_correlation: The Pearson correlation coefficient at best_lag.
+
+    Representation Invariants:
+        - self.points >= 0
+    """
+    points: int
+    pearson: float
+    pearson_interval: Tuple[float, float]
+    spearman: float
+    spearman_interval: Tuple[float, float]
+    best_lag: int
+    best_lag_correlation: float
+
+
+def align_series(series1: Tuple[numpy.ndarray, numpy.ndarray],
+                 series2: Tuple[numpy.ndarray, numpy.ndarray]) \
+        -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Return a tuple (x, y1, y2), where x holds the x values (such as years) that both series
+    have, in order, and y1 and y2 hold the y values of series1 and series2 at those x values.
+
+    Preconditions:
+        - the x values of each series are distinct
+
+    >>> x, y1, y2 = align_series((numpy.array([2000, 2001, 2003]), numpy.array([1, 2, 3])),\
+        (numpy.array([2003, 2001, 1999]), numpy.array([30.0, 20.0, 10.0])))
+    >>> x.tolist(), y1.tolist(), y2.tolist()
+    ([2001, 2003], [2, 3], [20.0, 30.0])
+    """
+    x, indices1, indices2 = numpy.intersect1d(series1[0], series2[0], assume_unique=True,
+                                              return_indices=True)
+    return (x, series1[1][indices1], series2[1][indices2])
+
+
+def rank(values: numpy.ndarray) -> numpy.ndarray:
+    """Return the rank of each value in values along its last axis, where the smallest value
+    has rank 1 and tied values share the average of their ranks.
+
+    >>> rank(numpy.array([10, 30, 20, 30])).tolist()
+    [1.0, 3.5, 2.0, 3.5]
+    >>> rank(numpy.array([[3, 1, 2], [5, 5, 5]])).tolist()
+    [[3.0, 1.0, 2.0], [2.0, 2.0, 2.0]]
+    """
+    order = numpy.argsort(values, axis=-1, kind='stable')
+    sorted_values = numpy.take_along_axis(values, order, axis=-1)
+
+    size = values.shape[-1]
+    positions = numpy.broadcast_to(numpy.arange(size), values.shape)
+
+    # Every value in a run of tied values gets the average of the first and last position
+    # of its run.
+    starts_run = numpy.ones(values.shape, dtype=bool)
+    starts_run[..., 1:] = sorted_values[..., 1:] != sorted_values[..., :-1]
+    ends_run = numpy.ones(values.shape, dtype=bool)
+    ends_run[..., :-1] = starts_run[..., 1:]
+
+    first = numpy.maximum.accumulate(numpy.where(starts_run, positions, 0), axis=-1)
+    last = numpy.flip(numpy.minimum.accumulate(
+        numpy.flip(numpy.where(ends_run, positions, size - 1), axis=-1), axis=-1), axis=-1)
+
+    ranks = numpy.empty(values.shape)
+    numpy.put_along_axis(ranks, order, (first + last) / 2 + 1, axis=-1)
+    return ranks
+
+
+def pearson(x: numpy.ndarray, y: numpy.ndarray) -> numpy.ndarray:
+    """Return the Pearson correlation coefficient of x and y along their last axis, or nan
+    where it is undefined because x or y is constant or there are fewer than _MIN_POINTS.
+
+    Preconditions:
+        - x.shape == y.shape
+
+    >>> float(pearson(numpy.array([1, 2, 3, 4]), numpy.array([2, 4, 6, 8])))
+    1.0
+    >>> pearson(numpy.array([[1, 2, 3], [1, 2, 3]]), numpy.array([[3, 2, 1], [5, 5, 5]])).tolist()
+    [-1.0, nan]
+    """
+    mask = numpy.ones(x.shape, dtype=bool)
+    return _masked_pearson(x.astype(float), y.astype(float), mask)
+
+
+def spearman(x: numpy.ndarray, y: numpy.ndarray) -> numpy.ndarray:
+    """Return the Spearman rank correlation coefficient of x and y along their last axis, with
+    tied values given the average of their ranks, or nan where it is undefined.
+
+    Preconditions:
+        - x.shape == y.shape
+
+    >>> float(spearman(numpy.array([1, 2, 3, 4]), numpy.array([1, 8, 27, 64])))
+    1.0
+    """
+    return pearson(rank(x), rank(y))
+
+
+def lagged_correlation(series1: Tuple[numpy.ndarray, numpy.ndarray],
+                       series2: Tuple[numpy.ndarray, numpy.ndarray], max_lag: int) \
+        -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Return a tuple (lags, correlations), where lags holds -max_lag, ..., max_lag and
+    correlations[i] is the Pearson correlation coefficient of the y value of series1 at each x
+    and the y value of series2 at x - lags[i], over the x values where both exist.
+
+    A strong correlation at a positive lag means series1 follows series2 by that many steps
+    of x. Every lag is computed at once.
+
+    Preconditions:
+        - the x values of each series are distinct integers
+        - max_lag >= 0
+
+    >>> lags, correlations = lagged_correlation(\
+        (numpy.arange(2000, 2010), numpy.array([0, 0, 1, 0, 0, 3, 0, 0, 2, 0])),\
+        (numpy.arange(2000, 2010), numpy.array([1, 0, 0, 3, 0, 0, 2, 0, 0, 0])), 2)
+    >>> lags.tolist(), round(float(correlations[4]), 6)
+    ([-2, -1, 0, 1, 2], 1.0)
+    """
+    # Put both series on one axis covering every x value, with nan where a series has no value.
+    first = min(series1[0].min(), series2[0].min())
+    size = int(max(series1[0].max(), series2[0].max()) - first + 1)
+
+    y1 = numpy.full(size, numpy.nan)
+    y1[series1[0] - first] = series1[1]
+    y2 = numpy.full(size, numpy.nan)
+    y2[series2[0] - first] = series2[1]
+
+    lags = numpy.arange(-max_lag, max_lag + 1)
+
+    # Row i holds series2 shifted by lags[i], so it lines up with series1.
+    shifted_indices = numpy.arange(size)[numpy.newaxis, :] - lags[:, numpy.newaxis]
+    in_range = (shifted_indices >= 0) & (shifted_indices < size)
+    shifted = numpy.where(in_range, y2[numpy.clip(shifted_indices, 0, size - 1)], numpy.nan)
+
+    x = numpy.broadcast_to(y1, shifted.shape)
+    mask = ~numpy.isnan(x) & ~numpy.isnan(shifted)
+
+    return (lags, _masked_pearson(x, shifted, mask))
+
+
+def bootstrap_interval(x: numpy.ndarray, y: numpy.ndarray, use_ranks: bool,
+                       samples: int = _BOOTSTRAP_SAMPLES, confidence: float = 0.95) \
+        -> Tuple[float, float]:
+    """Return the (low, high) bootstrap confidence interval of the Pearson correlation
+    coefficient of x and y, or of their Spearman rank correlation coefficient if use_ranks is
+    True. Return (nan, nan) if there are fewer than _MIN_POINTS values or no resample has a
+    defined correlation.
+
+    All of the resamples are drawn and correlated at once, as the rows of two arrays.
+
+    Preconditions:
+        - x.shape == y.shape and x.ndim == 1
+        - samples > 0
+        - 0 < confidence < 1
+    """
+    if len(x) < _MIN_POINTS:
+        return (numpy.nan, numpy.nan)
+
+    generator = numpy.random.default_rng(_BOOTSTRAP_SEED)
+    indices = generator.integers(0, len(x), size=(samples, len(x)))
+
+    if use_ranks:
+        correlations = spearman(x[indices], y[indices])
+    else:
+        correlations = pearson(x[indices], y[indices])
+
+    correlations = correlations[~numpy.isnan(correlations)]
+
+    if len(correlations) == 0:
+        return (numpy.nan, numpy.nan)
+
+    tail = (1 - confidence) / 2 * 100
+    low, high = numpy.percentile(correlations, [tail, 100 - tail])
+    return (float(low), float(high))
+
+
+def summarize(series1: Tuple[numpy.ndarray, numpy.ndarray],
+              series2: Tuple[numpy.ndarray, numpy.ndarray],
+              max_lag: int = 5) -> CorrelationSummary:
+    """Return the correlation statistics of series1 and series2, such as the number of
+    wildfires and the carbon dioxide emissions in each year, considering lags of up to max_lag.
+
+    Preconditions:
+        - the x values of each series are distinct integers
+        - max_lag >= 0
+    """
+    _, y1, y2 = align_series(series1, series2)
+
+    if len(y1) > 0:
+        lags, correlations = lagged_correlation(series1, series2, max_lag)
+    else:
+        lags, correlations = numpy.array([0]), numpy.array([numpy.nan])
+
+    if numpy.isnan(correlations).all():
+        best = list(lags).index(0)
+    else:
+        best = int(numpy.nanargmax(numpy.abs(correlations)))
+
+    return CorrelationSummary(points=len(y1),
+                              pearson=float(pearson(y1, y2)),
+                              pearson_interval=bootstrap_interval(y1, y2, False),
+                              spearman=float(spearman(y1, y2)),
+                              spearman_interval=bootstrap_interval(y1, y2, True),
+                              best_lag=int(lags[best]),
+                              best_lag_correlation=float(correlations[best]))
+
+
+def format_summary(summary: CorrelationSummary, step: str,
+                   names: Tuple[str, str] = ('the first series', 'the second series')) -> str:
+    """Return summary as text that can be shown on a plot, where step is the name of one
+    step of the x axis, such as 'year', and names are what the two series are called.
+
+    >>> print(format_summary(CorrelationSummary(40, 0.5, (0.25, 0.7), 0.45, (0.2, 0.65),\
+        -2, 0.6), 'year'))
+    Pearson r = 0.50 [0.25, 0.70]   Spearman ρ = 0.45 [0.20, 0.65]   (n = 40, 95% CI)
+    Strongest lagged correlation: r = 0.60 when the first series leads the second series by 2 years
+    """
+    lines = [f'Pearson r = {summary.pearson:.2f} [{summary.pearson_interval[0]:.2f}, '
+             f'{summary.pearson_interval[1]:.2f}]   '
+             f'Spearman ρ = {summary.spearman:.2f} [{summary.spearman_interval[0]:.2f}, '
+             f'{summary.spearman_interval[1]:.2f}]   (n = {summary.points}, 95% CI)']
+
+    steps = f'{abs(summary.best_lag)} {step}{"" if abs(summary.best_lag) == 1 else "s"}'
+
+    if summary.best_lag > 0:
+        lag = f'when {names[0]} follows {names[1]} by {steps}'
+    elif summary.best_lag < 0:
+        lag = f'when {names[0]} leads {names[1]} by {steps}'
+    else:
+        lag = 'with no lag'
+
+    lines.append(f'Strongest lagged correlation: r = {summary.best_lag_correlation:.2f} {lag}')
+
+    return '\n'.join(lines)
+
+
+def _masked_pearson(x: numpy.ndarray, y: numpy.ndarray, mask: numpy.ndarray) -> numpy.ndarray:
+    """Return the Pearson correlation coefficient of x and y along their last axis, using only
+    the values where mask is True, or nan where it is undefined.
+
+    Preconditions:
+        - x.shape == y.shape == mask.shape
+    """
+    counts = mask.sum(axis=-1)
+    safe_counts = numpy.maximum(counts, 1)
+
+    x = numpy.where(mask, x, 0.0)
+    y = numpy.where(mask, y, 0.0)
+
+    x_deviations = numpy.where(mask, x - (x.sum(axis=-1) / safe_counts)[..., numpy.newaxis], 0.0)
+    y_deviations = numpy.where(mask, y - (y.sum(axis=-1) / safe_counts)[..., numpy.newaxis], 0.0)
+
+    covariance = (x_deviations * y_deviations).sum(axis=-1)
+    spread = numpy.sqrt((x_deviations ** 2).sum(axis=-1) * (y_deviations ** 2).sum(axis=-1))
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        correlations = covariance / spread
+
+    # Rounding can push a perfect correlation just past 1.
+    correlations = numpy.clip(correlations, -1.0, 1.0)
+
+    return numpy.where((counts >= _MIN_POINTS) & (spread > 0), correlations, numpy.nan)
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['dataclasses', 'typing', 'numpy', 'python_ta.contracts'],
+        # the names (strs) of imported modules
+        'allowed-io': [],
+        # the names (strs) of functions that call print/open/input
+        'max-line-length': 100,
+        'disable': ['R1705', 'C0200']
+    })
+
+    import python_ta.contracts
+
+    python_ta.contracts.check_all_contracts()
+
+    import doctest
+
+    doctest.testmod()
@@ -5,76 +5,766 @@ Contains the Data class used to get and store various dataclasses
 CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
 """
 
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from collections.abc import Mapping
+import array
+import calendar
+import concurrent.futures
 import datetime
 import csv
+import itertools
+import numpy
 from wildfires import WildFire
+import parse_cache
 from carbon_emissions import CarbonEmission
 from temperature_deviation import TemperatureDeviance
 
 
+# The countries that wildfires can occur in. The index of a country in this tuple is the
+# country code stored in WildFireStore.countries.
+COUNTRIES: Tuple[str, str] = ('Canada', 'America')
+
+# Only fires that occurred in or after 1950 are accepted.
+_EARLIEST_ORDINAL: int = datetime.date(1950, 1, 1).toordinal()
+
+# The ordinal of 1970-01-01, the date that NumPy's datetime64 values count days from.
+_EPOCH_ORDINAL: int = datetime.date(1970, 1, 1).toordinal()
+
+# The number of rows of the American wildfire data that are parsed at a time.
+_CHUNK_SIZE: int = 65536
+
+# The size in degrees of the regions that WildFireCube counts fires in, and the number of rows
+# and columns of regions needed to cover the globe.
+_CUBE_CELL_SIZE: float = 10.0
+_CUBE_ROWS: int = 18
+_CUBE_COLUMNS: int = 36
+
+# The day of the year (where day 0 is January 1) that each month starts on, in years that are
+# not leap years (False) and leap years (True).
+_MONTH_STARTS: Dict[bool, numpy.ndarray] = {
+    is_leap: numpy.cumsum([0] + [calendar.monthrange(2000 if is_leap else 2001, month)[1]
+                                 for month in range(1, 12)])
+    for is_leap in (False, True)
+}
+
+# The indices of the months (where 0 is January) in each season: winter, spring, summer and
+# autumn.
+_SEASON_MONTHS: numpy.ndarray = numpy.array([[11, 0, 1], [2, 3, 4], [5, 6, 7], [8, 9, 10]])
+
+
+class WildFireStore:
+    """A columnar store of wildfires, kept sorted by the date each fire occurred.
+
+    Each fire is stored as one entry in each of four parallel arrays, instead of as a WildFire
+    object, which keeps millions of fires compact in memory.
+
+    Instance Attributes:
+        - ordinals: The proleptic Gregorian ordinal (datetime.date.toordinal) of the date each
+            fire occurred.
+        - latitudes: The latitude of each fire.
+        - longitudes: The longitude of each fire.
+        - countries: The index into COUNTRIES of the country each fire occurred in.
+        - pixels: The (x, y) pixel position of each fire on the fire map, with one row per fire,
+            or None if the fires have not been projected onto the map since the store was last
+            modified.
+
+    Representation Invariants:
+        - len(self.ordinals) == len(self.latitudes) == len(self.longitudes) \
+            == len(self.countries)
+        - all(self.ordinals[i] <= self.ordinals[i + 1] for i in range(len(self.ordinals) - 1))
+        - all(0 <= code < len(COUNTRIES) for code in self.countries)
+
+    Sample Usage:
+    >>> store = WildFireStore()
+    >>> store.add_fires(numpy.array([727000, 726000]), numpy.array([50.0, 60.0]),\
+        numpy.array([-120.0, -110.0]), 'Canada')
+    >>> store.get_fire(0)
+    WildFire(country='Canada', location=(60.0, -110.0), date=datetime.date(1988, 9, 20))
+    """
+
+    ordinals: numpy.ndarray
+    latitudes: numpy.ndarray
+    longitudes: numpy.ndarray
+    countries: numpy.ndarray
+    pixels: Optional[numpy.ndarray]
+
+    # Private Instance Attributes:
+    # - _day_index: A tuple (days, offsets) indexing the fires by date, or None if it has not
+    #               been built since the store was last modified. days holds the sorted, distinct
+    #               values of self.ordinals, and the fires that occurred on days[i] are at indices
+    #               offsets[i], ..., offsets[i + 1] - 1.
+    # - _grid: The spatial index over the fires, or None if it has not been built since the
+    #          store was last modified.
+    _day_index: Optional[Tuple[numpy.ndarray, numpy.ndarray]]
+    _grid: Optional['WildFireGrid']
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.ordinals = numpy.empty(0, dtype=numpy.int32)
+        self.latitudes = numpy.empty(0, dtype=numpy.float64)
+        self.longitudes = numpy.empty(0, dtype=numpy.float64)
+        self.countries = numpy.empty(0, dtype=numpy.int8)
+        self.pixels = None
+        self._day_index = None
+        self._grid = None
+
+    def __len__(self) -> int:
+        """Return the number of fires in the store."""
+        return len(self.ordinals)
+
+    def add_fires(self, ordinals: numpy.ndarray, latitudes: numpy.ndarray,
+                  longitudes: numpy.ndarray, country: str) -> None:
+        """Add the given fires, all of which occurred in country, to the store.
+
+        Preconditions:
+            - len(ordinals) == len(latitudes) == len(longitudes)
+            - country in COUNTRIES
+        """
+        codes = numpy.full(len(ordinals), COUNTRIES.index(country), dtype=numpy.int8)
+
+        ordinals = numpy.concatenate((self.ordinals, ordinals.astype(numpy.int32)))
+
+        # A stable sort keeps fires that occurred on the same date in the order they were added.
+        order = numpy.argsort(ordinals, kind='stable')
+
+        self.ordinals = ordinals[order]
+        self.latitudes = numpy.concatenate((self.latitudes, latitudes))[order]
+        self.longitudes = numpy.concatenate((self.longitudes, longitudes))[order]
+        self.countries = numpy.concatenate((self.countries, codes))[order]
+        self.pixels = None
+        self._day_index = None
+        self._grid = None
+
+    def project(self, projection: Callable[[numpy.ndarray, numpy.ndarray], numpy.ndarray]) \
+            -> None:
+        """Set self.pixels to the pixel positions of every fire, computed all at once by calling
+        projection on self.latitudes and self.longitudes.
+
+        Preconditions:
+            - projection returns an array with one (x, y) row per coordinate it is given
+        """
+        self.pixels = projection(self.latitudes, self.longitudes)
+
+    def first_ordinal(self) -> int:
+        """Return the ordinal of the date of the earliest fire.
+
+        Preconditions:
+            - len(self) > 0
+        """
+        return int(self.ordinals[0])
+
+    def last_ordinal(self) -> int:
+        """Return the ordinal of the date of the latest fire.
+
+        Preconditions:
+            - len(self) > 0
+        """
+        return int(self.ordinals[-1])
+
+    def unique_ordinals(self) -> numpy.ndarray:
+        """Return the sorted ordinals of every date on which at least one fire occurred."""
+        return self._get_day_index()[0]
+
+    def fires_between(self, start: int, end: int) -> slice:
+        """Return the slice of indices of every fire that occurred on or after the date with
+        ordinal start, and before the date with ordinal end.
+
+        Since the store is sorted by date, these fires are contiguous, and the slice can be used
+        to index any of the columns directly. This takes O(log n) time.
+
+        >>> store = WildFireStore()
+        >>> store.add_fires(numpy.array([10, 12, 12, 15]), numpy.zeros(4), numpy.zeros(4),\
+            'Canada')
+        >>> store.fires_between(11, 15)
+        slice(1, 3, None)
+        """
+        days, offsets = self._get_day_index()
+        first_day, end_day = numpy.searchsorted(days, (start, end), side='left')
+        return slice(int(offsets[first_day]), int(offsets[end_day]))
+
+    def day_bounds(self, ordinal: int) -> Tuple[int, int]:
+        """Return the (start, end) indices such that the fires at indices start, ..., end - 1 are
+        exactly the fires that occurred on the date with the given ordinal.
+        """
+        day = self.fires_between(ordinal, ordinal + 1)
+        return (day.start, day.stop)
+
+    def query(self, bbox: Tuple[float, float, float, float],
+              date_range: Optional[Tuple[int, int]] = None,
+              country: Optional[str] = None) -> numpy.ndarray:
+        """Return the sorted indices of every fire inside bbox, optionally only those in
+        date_range and country. See WildFireGrid.query for details.
+
+        The spatial index is built the first time this is called.
+
+        Preconditions:
+            - bbox[0] <= bbox[2] and bbox[1] <= bbox[3]
+            - date_range is None or date_range[0] <= date_range[1]
+            - country is None or country in COUNTRIES
+        """
+        if self._grid is None:
+            self._grid = WildFireGrid(self)
+
+        return self._grid.query(bbox, date_range, country)
+
+    def _get_day_index(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Return the (days, offsets) index of the fires by date, building it if necessary."""
+        if self._day_index is None:
+            days, starts = numpy.unique(self.ordinals, return_index=True)
+            offsets = numpy.append(starts, len(self.ordinals))
+            self._day_index = (days, offsets)
+
+        return self._day_index
+
+    def country_mask(self, country: str) -> numpy.ndarray:
+        """Return a boolean array that is True at the index of every fire that occurred in country.
+
+        Preconditions:
+            - country in COUNTRIES
+        """
+        return self.countries == COUNTRIES.index(country)
+
+    def get_fire(self, index: int) -> WildFire:
+        """Return the fire at index as a WildFire object.
+
+        Preconditions:
+            - 0 <= index < len(self)
+        """
+        return WildFire(COUNTRIES[self.countries[index]],
+                        (float(self.latitudes[index]), float(self.longitudes[index])),
+                        datetime.date.fromordinal(int(self.ordinals[index])))
+
+    def get_fires(self, start: int, end: int) -> List[WildFire]:
+        """Return the fires at indices start, ..., end - 1 as WildFire objects.
+
+        Preconditions:
+            - 0 <= start <= end <= len(self)
+        """
+        return [self.get_fire(index) for index in range(start, end)]
+
+
+class WildFireGrid:
+    """A spatial index over the fires in a WildFireStore, bucketing the fires into the cells of a
+    uniform latitude/longitude grid.
+
+    Within each cell, the fires are kept sorted by date, so the fires inside a bounding box
+    during a range of dates can be found without scanning every fire.
+
+    Sample Usage:
+    >>> store = WildFireStore()
+    >>> store.add_fires(numpy.array([10, 11, 12]), numpy.array([50.5, 50.7, 20.0]),\
+        numpy.array([-100.5, -100.2, -90.0]), 'Canada')
+    >>> grid = WildFireGrid(store, cell_size=1.0)
+    >>> grid.query((50.0, -101.0, 51.0, -100.0)).tolist()
+    [0, 1]
+    >>> grid.query((50.0, -101.0, 51.0, -100.0), date_range=(11, 20)).tolist()
+    [1]
+
+    A date_range beyond the ordinals that can occur is clamped, so it never spills into the
+    neighbouring cells:
+    >>> store = WildFireStore()
+    >>> store.add_fires(numpy.array([730001, 730002]), numpy.array([50.5, 50.5]),\
+        numpy.array([-100.5, -99.5]), 'Canada')
+    >>> grid = WildFireGrid(store, cell_size=1.0)
+    >>> grid.query((50.0, -101.0, 51.0, -99.0),\
+        date_range=(730000, datetime.date.max.toordinal())).tolist()
+    [0, 1]
+    >>> grid.count((50.0, -101.0, 51.0, -99.0), date_range=(-1, 730002))
+    1
+    """
+
+    # Private Instance Attributes:
+    # - _store: The store that is being indexed.
+    # - _cell_size: The width and height of each grid cell, in degrees.
+    # - _columns: The number of grid cells in each row of the grid.
+    # - _order: The indices of the fires in _store, sorted by grid cell and then by date.
+    # - _keys: The sorted key of each fire in _order, which combines the fire's grid cell
+    #          and the ordinal of its date, so that both can be binary searched at once.
+    # - _ORDINAL_BITS: The number of low bits of a key that hold the date's ordinal.
+    _store: WildFireStore
+    _cell_size: float
+    _columns: int
+    _order: numpy.ndarray
+    _keys: numpy.ndarray
+
+    _ORDINAL_BITS: int = 20
+
+    def __init__(self, store: WildFireStore, cell_size: float = 1.0) -> None:
+        """Build a grid with cells cell_size degrees wide over the fires in store.
+
+        Preconditions:
+            - cell_size > 0
+            - all(ordinal < 2 ** self._ORDINAL_BITS for ordinal in store.ordinals)
+        """
+        self._store = store
+        self._cell_size = cell_size
+        self._columns = int(numpy.ceil(360 / cell_size)) + 1
+
+        cells = self._cells(store.latitudes, store.longitudes)
+
+        # The store is already sorted by date, so a stable sort by cell keeps each cell's fires
+        # sorted by date.
+        self._order = numpy.argsort(cells, kind='stable')
+        self._keys = (cells[self._order] << self._ORDINAL_BITS) \
+            | store.ordinals[self._order].astype(numpy.int64)
+
+    def query(self, bbox: Tuple[float, float, float, float],
+              date_range: Optional[Tuple[int, int]] = None,
+              country: Optional[str] = None) -> numpy.ndarray:
+        """Return the sorted indices into the store of every fire inside bbox.
+
+        bbox is (minimum latitude, minimum longitude, maximum latitude, maximum longitude),
+        and includes its edges. If date_range is given as (start, end), only fires on or after
+        the date with ordinal start and before the date with ordinal end are included. If
+        country is given, only fires that occurred in country are included.
+
+        Preconditions:
+            - bbox[0] <= bbox[2] and bbox[1] <= bbox[3]
+            - date_range is None or date_range[0] <= date_range[1]
+            - country is None or country in COUNTRIES
+        """
+        min_latitude, min_longitude, max_latitude, max_longitude = bbox
+        start, end = date_range if date_range is not None else (0, 1 << self._ORDINAL_BITS)
+
+        # Keep the range inside the ordinal bits of a key, so it cannot reach into other cells.
+        start = min(max(start, 0), 1 << self._ORDINAL_BITS)
+        end = min(max(end, 0), 1 << self._ORDINAL_BITS)
+
+        # Each row of cells in the bounding box is a contiguous run of cell ids.
+        first_row, first_column = self._cell_position(min_latitude, min_longitude)
+        last_row, last_column = self._cell_position(max_latitude, max_longitude)
+        cells = (numpy.arange(first_row, last_row + 1)[:, None] * self._columns
+                 + numpy.arange(first_column, last_column + 1)[None, :]).ravel()
+
+        # Binary search every cell's date range at once.
+        lows = numpy.searchsorted(self._keys, (cells << self._ORDINAL_BITS) + start)
+        highs = numpy.searchsorted(self._keys, (cells << self._ORDINAL_BITS) + end)
+        candidates = self._order[_concatenate_ranges(lows, highs)]
+
+        # Cells on the edge of the bounding box may contain fires outside of it.
+        latitudes = self._store.latitudes[candidates]
+        longitudes = self._store.longitudes[candidates]
+        mask = (latitudes >= min_latitude) & (latitudes <= max_latitude) \
+            & (longitudes >= min_longitude) & (longitudes <= max_longitude)
+
+        if country is not None:
+            mask &= self._store.countries[candidates] == COUNTRIES.index(country)
+
+        return numpy.sort(candidates[mask])
+
+    def count(self, bbox: Tuple[float, float, float, float],
+              date_range: Optional[Tuple[int, int]] = None,
+              country: Optional[str] = None) -> int:
+        """Return the number of fires that query(bbox, date_range, country) would return.
+
+        Preconditions:
+            - bbox[0] <= bbox[2] and bbox[1] <= bbox[3]
+            - date_range is None or date_range[0] <= date_range[1]
+            - country is None or country in COUNTRIES
+        """
+        return len(self.query(bbox, date_range, country))
+
+    def _cells(self, latitudes: numpy.ndarray, longitudes: numpy.ndarray) -> numpy.ndarray:
+        """Return the id of the grid cell containing each of the given coordinates."""
+        rows = numpy.floor((numpy.clip(latitudes, -90, 90) + 90) / self._cell_size)
+        columns = numpy.floor((numpy.clip(longitudes, -180, 180) + 180) / self._cell_size)
+        return rows.astype(numpy.int64) * self._columns + columns.astype(numpy.int64)
+
+    def _cell_position(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        """Return the (row, column) of the grid cell containing the given coordinates."""
+        cell = int(self._cells(numpy.array([latitude]), numpy.array([longitude]))[0])
+        return (cell // self._columns, cell % self._columns)
+
+
+class WildFireDateView(Mapping):
+    """A read-only, dict-like view of a WildFireStore, mapping the date a fire occurred to a list
+    of WildFire objects for each fire that occurred at that date.
+
+    The WildFire objects are created when a date is looked up, so the view takes no extra
+    memory. It behaves like the Dict[datetime.date, List[WildFire]] that Data.wild_fires used
+    to be.
+    """
+
+    # Private Instance Attributes:
+    # - _store: The store that is being viewed.
+    _store: WildFireStore
+
+    def __init__(self, store: WildFireStore) -> None:
+        """Initialize a view of store."""
+        self._store = store
+
+    def __getitem__(self, date: datetime.date) -> List[WildFire]:
+        """Return the list of fires that occurred at date.
+
+        Raise a KeyError if no fires occurred at date.
+        """
+        if not isinstance(date, datetime.date):
+            raise KeyError(date)
+
+        start, end = self._store.day_bounds(date.toordinal())
+
+        if start == end:
+            raise KeyError(date)
+
+        return self._store.get_fires(start, end)
+
+    def __iter__(self) -> Iterator[datetime.date]:
+        """Return an iterator over every date on which at least one fire occurred, in order."""
+        return (datetime.date.fromordinal(ordinal)
+                for ordinal in self._store.unique_ordinals().tolist())
+
+    def __len__(self) -> int:
+        """Return the number of dates on which at least one fire occurred."""
+        return len(self._store.unique_ordinals())
+
+
+class WildFireCube:
+    """Precomputed counts of wildfires, broken down by country, year and day of the year, and
+    by country, year, month and region.
+
+    The counts are built once when the wildfire data is parsed and are cached along with it,
+    and each rollup is computed from them the first time it is asked for and then kept, so
+    any breakdown of the fires can be answered without looking at the fires themselves.
+
+    A region is a cell of a grid of _CUBE_CELL_SIZE by _CUBE_CELL_SIZE degrees covering the
+    whole globe. Region r covers the latitudes from -90 + (r // _CUBE_COLUMNS) * _CUBE_CELL_SIZE
+    and the longitudes from -180 + (r % _CUBE_COLUMNS) * _CUBE_CELL_SIZE.
+
+    Instance Attributes:
+        - first_year: The first year that is counted.
+        - daily: daily[c][y][d] is the number of fires that occurred in COUNTRIES[c] on day d of
+            year first_year + y, where day 0 is January 1.
+        - regional: regional[c][y][m][r] is the number of fires that occurred in COUNTRIES[c]
+            and region r during month m + 1 of year first_year + y.
+
+    Representation Invariants:
+        - self.daily.shape == (len(COUNTRIES), self.regional.shape[1], 366)
+        - self.regional.shape[2:] == (12, _CUBE_ROWS * _CUBE_COLUMNS)
+        - self.daily.sum() == self.regional.sum()
+
+    Sample Usage:
+    >>> cube = WildFireCube()
+    >>> cube.add_counts('Canada', count_wild_fires(numpy.array(\
+        [datetime.date(2000, 7, 1).toordinal(), datetime.date(2001, 1, 5).toordinal()]),\
+        numpy.array([50.0, 60.0]), numpy.array([-120.0, -110.0])))
+    >>> years, counts = cube.count_per_year()
+    >>> years.tolist(), counts.tolist()
+    ([2000, 2001], [[1, 1], [0, 0]])
+    >>> cube.count_per_season()[1][0].tolist()
+    [[0, 0, 1, 0], [1, 0, 0, 0]]
+    """
+
+    first_year: int
+    daily: numpy.ndarray
+    regional: numpy.ndarray
+
+    # Private Instance Attributes:
+    # - _rollups: A mapping of the name of each rollup method to the counts it returned, for
+    #             the rollups that have been computed since the counts last changed.
+    _rollups: Dict[str, numpy.ndarray]
+
+    def __init__(self) -> None:
+        """Initialize a cube that has not counted any fires."""
+        self.first_year = datetime.date.fromordinal(_EARLIEST_ORDINAL).year
+        self.daily = numpy.zeros((len(COUNTRIES), 0, 366), dtype=numpy.int32)
+        self.regional = numpy.zeros((len(COUNTRIES), 0, 12, _CUBE_ROWS * _CUBE_COLUMNS),
+                                    dtype=numpy.int32)
+        self._rollups = {}
+
+    def add_counts(self, country: str, counts: Dict[str, numpy.ndarray]) -> None:
+        """Add counts, the counts of fires that occurred in country, to the cube.
+
+        Preconditions:
+            - counts has the format returned by count_wild_fires
+            - country in COUNTRIES
+        """
+        first_year = int(counts['cube_first_year'])
+        daily = counts['cube_daily']
+        regional = counts['cube_regional']
+
+        if len(daily) > 0:
+            # Grow the year axis so it covers both the counted years and the new ones.
+            years = self.daily.shape[1]
+            if years == 0:
+                self.first_year = first_year
+
+            new_first_year = min(self.first_year, first_year)
+            new_last_year = max(self.first_year + years, first_year + len(daily))
+
+            self.daily = _pad_years(self.daily, self.first_year - new_first_year,
+                                    new_last_year - self.first_year - years)
+            self.regional = _pad_years(self.regional, self.first_year - new_first_year,
+                                       new_last_year - self.first_year - years)
+            self.first_year = new_first_year
+
+            offset = first_year - self.first_year
+            code = COUNTRIES.index(country)
+            self.daily[code, offset:offset + len(daily)] += daily
+            self.regional[code, offset:offset + len(regional)] += regional
+
+        self._rollups = {}
+
+    def years(self) -> numpy.ndarray:
+        """Return every year that is counted, in order."""
+        return numpy.arange(self.first_year, self.first_year + self.daily.shape[1])
+
+    def count_per_year(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Return a tuple (years, counts), where years is self.years() and counts[c][y] is the
+        number of fires that occurred in COUNTRIES[c] during years[y].
+        """
+        if 'year' not in self._rollups:
+            self._rollups['year'] = self.daily.sum(axis=2)
+
+        return (self.years(), self._rollups['year'])
+
+    def count_per_month(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Return a tuple (years, counts), where years is self.years() and counts[c][y][m] is
+        the number of fires that occurred in COUNTRIES[c] during month m + 1 of years[y].
+        """
+        if 'month' not in self._rollups:
+            counts = numpy.zeros(self.daily.shape[:2] + (12,), dtype=self.daily.dtype)
+            leap = numpy.array([calendar.isleap(year) for year in self.years()], dtype=bool)
+
+            # The day of the year that each month starts on depends on whether it is a leap
+            # year, so leap years and other years are added up separately.
+            for is_leap in (False, True):
+                years = leap == is_leap
+                if years.any():
+                    counts[:, years] = numpy.add.reduceat(self.daily[:, years],
+                                                          _MONTH_STARTS[is_leap], axis=2)
+
+            self._rollups['month'] = counts
+
+        return (self.years(), self._rollups['month'])
+
+    def count_per_season(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Return a tuple (years, counts), where years is self.years() and counts[c][y][s] is
+        the number of fires that occurred in COUNTRIES[c] during season s of years[y].
+
+        The seasons are winter (December, January and February), spring, summer and autumn,
+        in that order. The winter of a year includes that year's December.
+        """
+        if 'season' not in self._rollups:
+            months = self.count_per_month()[1]
+            self._rollups['season'] = months[:, :, _SEASON_MONTHS].sum(axis=3)
+
+        return (self.years(), self._rollups['season'])
+
+    def count_per_day_of_year(self) -> numpy.ndarray:
+        """Return an array counts, where counts[c][d] is the number of fires that occurred in
+        COUNTRIES[c] on day d of any year, where day 0 is January 1.
+        """
+        if 'day_of_year' not in self._rollups:
+            self._rollups['day_of_year'] = self.daily.sum(axis=1)
+
+        return self._rollups['day_of_year']
+
+    def count_in_region(self, bbox: Tuple[float, float, float, float]) \
+            -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Return a tuple (years, counts), where years is self.years() and counts[c][y][m] is
+        the number of fires that occurred in COUNTRIES[c] and in the region given by bbox during
+        month m + 1 of years[y].
+
+        bbox is (min_latitude, min_longitude, max_latitude, max_longitude). The counts are
+        only as fine as the regions of the cube: a region is counted if its centre is in bbox.
+
+        Preconditions:
+            - bbox[0] <= bbox[2] and bbox[1] <= bbox[3]
+        """
+        rows, columns = numpy.divmod(numpy.arange(_CUBE_ROWS * _CUBE_COLUMNS), _CUBE_COLUMNS)
+        latitudes = -90 + (rows + 0.5) * _CUBE_CELL_SIZE
+        longitudes = -180 + (columns + 0.5) * _CUBE_CELL_SIZE
+
+        regions = numpy.flatnonzero((bbox[0] <= latitudes) & (latitudes <= bbox[2])
+                                    & (bbox[1] <= longitudes) & (longitudes <= bbox[3]))
+
+        return (self.years(), self.regional[:, :, :, regions].sum(axis=3))
+
+
 class Data:
     """A Class used to handle various types of data
 
     Instance Attributes:
+        - wild_fire_store: The columnar store containing every wildfire.
         - wild_fires: A mapping of the date a fire occurred, to a list of WildFire objects for each
-            fire that occurred at that date.
+            fire that occurred at that date. This is a read-only view of wild_fire_store.
+        - wild_fire_cube: The precomputed counts of the fires in wild_fire_store.
         - carbon_emissions: A mapping of the date (year only, month and day are placeholder values)
             to a list of CarbonEmission objects for that date. The list contain two elements, one
             object for Canada and America
         - temperature_deviation: A mapping of the date (year only, month and day are placeholder
             values) to a CarbonEmissions object for that date.
 
+    Each of these is loaded the first time it is accessed, so creating a Data instance is
+    instant and a dataset that is never used is never read.
+
     Sample Usage:
     >>> my_data = Data()
     """
 
-    wild_fires: Dict[datetime.date, List[WildFire]]
-    carbon_emissions: Dict[datetime.date, List[CarbonEmission]]
-    temperature_deviation: Dict[datetime.date, TemperatureDeviance]
-
-    def __init__(self) -> None:
+    # Private Instance Attributes:
+    # - _cache_directory: The directory that parsed wildfire data is cached in, or None if
+    #                     the wildfire data should not be cached.
+    # - _workers: The maximum number of worker processes used to load the wildfire data,
+    #             or 0 if the wildfire data is loaded in this process.
+    # - _wild_fire_store: The value of wild_fire_store, or None if it has not been loaded yet.
+    # - _wild_fires: The value of wild_fires, or None if it has not been loaded yet.
+    # - _wild_fire_cube: The value of wild_fire_cube, or None if it has not been loaded yet.
+    # - _carbon_emissions: The value of carbon_emissions, or None if it has not been loaded yet.
+    # - _temperature_deviation: The value of temperature_deviation, or None if it has not been
+    #                           loaded yet.
+    # - _DEFAULT_WORKERS: The default maximum number of worker processes used to load the
+    #                     wildfire data.
+    _cache_directory: Optional[str]
+    _workers: int
+    _wild_fire_store: Optional[WildFireStore]
+    _wild_fires: Optional[WildFireDateView]
+    _wild_fire_cube: Optional[WildFireCube]
+    _carbon_emissions: Optional[Dict[datetime.date, List[CarbonEmission]]]
+    _temperature_deviation: Optional[Dict[datetime.date, TemperatureDeviance]]
+
+    _DEFAULT_WORKERS: int = 2
+
+    def __init__(self, cache_directory: Optional[str] = parse_cache.CACHE_DIRECTORY,
+                 workers: int = _DEFAULT_WORKERS, lazy: bool = True) -> None:
         """
-        Initialize empty dictionaries.
-        """
-        self.wild_fires = {}
-        self.carbon_emissions = {}
-        self.temperature_deviation = {}
-        self.get_wild_fires_canada('canada_wildfire_data.csv')
-        self.get_wild_fires_america('america_wildfire_data.csv')
-        self.get_carbon_emission_data('carbon_data.csv')
-        self.get_temperature_deviance_data('temperature_deviance_data.csv')
+        Initialize the datasets as not loaded yet. If lazy is False, load every dataset now
+        instead of when it is first accessed.
 
-    def get_wild_fires_canada(self, location: str) -> None:
-        """Mutates the wild_fires local variable to include the wild_fire_data from canada
+        The parsed wildfire data is cached in cache_directory, so later instances can skip
+        parsing the wildfire CSV files unless they have changed. If cache_directory is None,
+        the wildfire data is always parsed and never cached.
+
+        The Canadian and American wildfire data are loaded in up to workers separate processes.
+        If workers is 0, all of the data is loaded one file after another in this process,
+        which is easier to debug.
 
         Preconditions:
-            - location is the location of the 'canada_wildfire_data.csv file.
+            - workers >= 0
+        """
+        self._cache_directory = cache_directory
+        self._workers = workers
+        self._wild_fire_store = None
+        self._wild_fires = None
+        self._wild_fire_cube = None
+        self._carbon_emissions = None
+        self._temperature_deviation = None
+
+        if not lazy:
+            self.load_all()
+
+    @property
+    def wild_fire_store(self) -> WildFireStore:
+        """Return the columnar store containing every wildfire, loading it if necessary."""
+        if self._wild_fire_store is None:
+            self._load_wild_fires(lambda: None)
+        return self._wild_fire_store
+
+    @property
+    def wild_fires(self) -> WildFireDateView:
+        """Return the mapping of dates to the fires that occurred at that date, loading the
+        wildfire data if necessary."""
+        if self._wild_fires is None:
+            self._load_wild_fires(lambda: None)
+        return self._wild_fires
+
+    @property
+    def wild_fire_cube(self) -> WildFireCube:
+        """Return the precomputed counts of the wildfires, loading the wildfire data if
+        necessary."""
+        if self._wild_fire_cube is None:
+            self._load_wild_fires(lambda: None)
+        return self._wild_fire_cube
+
+    @property
+    def carbon_emissions(self) -> Dict[datetime.date, List[CarbonEmission]]:
+        """Return the carbon emission data, loading it if necessary."""
+        if self._carbon_emissions is None:
+            self.get_carbon_emission_data('carbon_data.csv')
+        return self._carbon_emissions
+
+    @property
+    def temperature_deviation(self) -> Dict[datetime.date, TemperatureDeviance]:
+        """Return the temperature deviance data, loading it if necessary."""
+        if self._temperature_deviation is None:
+            self.get_temperature_deviance_data('temperature_deviance_data.csv')
+        return self._temperature_deviation
+
+    def load_all(self) -> None:
+        """Load every dataset that has not been loaded yet.
+
+        If the wildfire data is loaded in worker processes, the carbon and temperature data are
+        loaded in this process while the workers run.
         """
+        if self._wild_fire_store is None:
+            self._load_wild_fires(self._load_small_datasets)
+        else:
+            self._load_small_datasets()
+
+    def _load_small_datasets(self) -> None:
+        """Load the carbon and temperature data if they have not been loaded yet."""
+        _ = self.carbon_emissions
+        _ = self.temperature_deviation
+
+    def _load_wild_fires(self, meanwhile: Callable[[], None]) -> None:
+        """Load the Canadian and American wildfire data into a new wild_fire_store, calling
+        meanwhile while the data is being parsed.
+
+        If self._workers > 0, the files whose parse cache is missing or out of date are parsed
+        in up to self._workers worker processes and meanwhile is called while the workers run.
+        Up to date parse caches are read in this process, since that is faster than starting a
+        worker. The wildfire data is merged into the wild_fire_store in the same order either
+        way.
+
+        The wildfire data is only stored once both files have been loaded, so that if either
+        fails to load, the next access tries to load it again.
+        """
+        sources = [('canada_wildfire_data.csv', read_wild_fires_canada, 'Canada'),
+                   ('america_wildfire_data.csv', read_wild_fires_america, 'America')]
 
-        with open(location, encoding="utf8") as file:
-            reader = csv.reader(file)
+        if self._workers == 0:
+            columns = [read_cached_wild_fires(location, reader, self._cache_directory)
+                       for location, reader, _ in sources]
+        elif self._cache_directory is None:
+            columns = [None] * len(sources)
+        else:
+            columns = [parse_cache.load_columns(location, self._cache_directory)
+                       for location, _, _ in sources]
 
-            # Gets the headers of the list, and moves the reader so the header is not included
-            # in the data.
-            headers = next(reader)
+        missing = [i for i in range(len(sources)) if columns[i] is None]
+
+        if missing:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=min(self._workers, len(missing))) as executor:
+                futures = {i: executor.submit(parse_wild_fires, sources[i][0], sources[i][1],
+                                              self._cache_directory)
+                           for i in missing}
+
+                meanwhile()
+
+                for i in missing:
+                    columns[i] = futures[i].result()
+        else:
+            meanwhile()
 
-            latitude_index = headers.index('LATITUDE')
-            longitude_index = headers.index('LONGITUDE')
-            year_index = headers.index('YEAR')
-            month_index = headers.index('MONTH')
-            day_index = headers.index('DAY')
+        store = WildFireStore()
+        cube = WildFireCube()
 
-            for row in reader:
+        for (_, _, country), country_columns in zip(sources, columns):
+            _add_fires(store, cube, country_columns, country)
 
-                if int(row[year_index]) != 0 and int(row[month_index]) != 0 \
-                        and int(row[day_index]) != 0:
-                    location = (float(row[latitude_index]), float(row[longitude_index]))
-                    date = datetime.date(int(row[year_index]), int(row[month_index]),
-                                         int(row[day_index]))
+        self._wild_fire_store = store
+        self._wild_fires = WildFireDateView(store)
+        self._wild_fire_cube = cube
 
-                    fire = WildFire('Canada', location, date)
-                    self._add_fire(date, fire)
+    def get_wild_fires_canada(self, location: str) -> None:
+        """Mutates the wild_fires local variable to include the wild_fire_data from canada
+
+        Preconditions:
+            - location is the location of the 'canada_wildfire_data.csv file.
+        """
+        columns = read_cached_wild_fires(location, read_wild_fires_canada, self._cache_directory)
+        _add_fires(self.wild_fire_store, self.wild_fire_cube, columns, 'Canada')
 
     def get_wild_fires_america(self, location: str) -> None:
         """Mutates the wild_fires local variable to include the wild_fire_data from america
@@ -82,30 +772,8 @@ class Data:
         Preconditions:
             - location is the location of the 'america_wildfire_data.csv' file.
         """
-
-        with open(location) as file:
-            reader = csv.reader(file)
-
-            # Gets the headers of the list, and moves the reader so the header is not included
-            # in the data.
-            headers = next(reader)
-
-            latitude_index = headers.index('LATITUDE')
-            longitude_index = headers.index('LONGITUDE')
-            date_index = headers.index('DISCOVERY_DATE')
-
-            for row in reader:
-                location = (float(row[latitude_index]), float(row[longitude_index]))
-
-                # Stored in the data as "year-month-day"
-                date_list = row[date_index].split('-')
-
-                date = datetime.date(year=int(date_list[0]),
-                                     month=int(date_list[1]),
-                                     day=int(date_list[2]))
-
-                fire = WildFire('America', location, date)
-                self._add_fire(date, fire)
+        columns = read_cached_wild_fires(location, read_wild_fires_america, self._cache_directory)
+        _add_fires(self.wild_fire_store, self.wild_fire_cube, columns, 'America')
 
     def get_carbon_emission_data(self, location: str) -> None:
         """Mutates the carbon_emissions local variable to include the carbon emission data.
@@ -113,6 +781,8 @@ class Data:
         Preconditions:
             - location is the location of the 'carbon_data.csv' file.
         """
+        # Read into a new dictionary first, so nothing is stored if the file fails to load.
+        emissions = {}
 
         with open(location) as file:
             reader = csv.reader(file)
@@ -136,21 +806,27 @@ class Data:
 
                 for year in range(1960, 2017):  # 2017 is not included
                     # Month and Day are placeholder values.
+                    date = datetime.date(year, 1, 1)
 
                     carbon_emissions = float(entry[current_index])
-                    carbon_data = CarbonEmission(country, carbon_emissions,
-                                                 datetime.date(year, 1, 1))
+                    carbon_data = CarbonEmission(country, carbon_emissions, date)
 
                     current_index += 1
 
-                    if datetime.date(year, 1, 1) in self.carbon_emissions:
-                        self.carbon_emissions[datetime.date(year, 1, 1)].append(carbon_data)
+                    if date in emissions:
+                        emissions[date].append(carbon_data)
 
                     else:
-                        self.carbon_emissions[datetime.date(year, 1, 1)] = [carbon_data]
+                        emissions[date] = [carbon_data]
 
                 current_index = starting_index
 
+        if self._carbon_emissions is None:
+            self._carbon_emissions = emissions
+        else:
+            for date, entries in emissions.items():
+                self._carbon_emissions.setdefault(date, []).extend(entries)
+
     def get_temperature_deviance_data(self, location: str) -> None:
         """Mutates the temperature_deviation local variable to include the temperature
         deviation data.
@@ -158,6 +834,8 @@ class Data:
         Preconditions:
             - location is the location of the 'temperature_deviance_data.csv' file.
         """
+        # Read into a new dictionary first, so nothing is stored if the file fails to load.
+        deviations = {}
 
         with open(location) as file:
             reader = csv.reader(file)
@@ -176,7 +854,12 @@ class Data:
 
                 temperature_deviance_data = TemperatureDeviance(value, date)
 
-                self.temperature_deviation[date] = temperature_deviance_data
+                deviations[date] = temperature_deviance_data
+
+        if self._temperature_deviation is None:
+            self._temperature_deviation = deviations
+        else:
+            self._temperature_deviation.update(deviations)
 
     def write_canadian_wild_fire_data(self, location: str) -> None:
         """Write the canadian wild fire data to a csv file named location. This removes all
@@ -191,13 +874,15 @@ class Data:
             headers = ['YEAR', 'MONTH', 'DAY', 'LATITUDE', 'LONGITUDE']
             writer.writerow(headers)
 
-            for date in self.wild_fires:
-                for fire in self.wild_fires[date]:
-                    if fire.country == 'Canada':
-                        year, month, day = fire.date.year, fire.date.month, fire.date.day
-                        latitude, longitude = fire.location
-                        row = [year, month, day, latitude, longitude]
-                        writer.writerow(row)
+            store = self.wild_fire_store
+            mask = store.country_mask('Canada')
+
+            for ordinal, latitude, longitude in zip(store.ordinals[mask].tolist(),
+                                                    store.latitudes[mask].tolist(),
+                                                    store.longitudes[mask].tolist()):
+                date = datetime.date.fromordinal(ordinal)
+                row = [date.year, date.month, date.day, latitude, longitude]
+                writer.writerow(row)
 
     def write_american_wild_fire_data(self, location: str) -> None:
         """Write the american wild fire data to a csv file named location. This removes all
@@ -212,15 +897,17 @@ class Data:
             headers = ['DISCOVERY_DATE', 'LATITUDE', 'LONGITUDE']
             writer.writerow(headers)
 
-            for date in self.wild_fires:
-                for fire in self.wild_fires[date]:
-                    if fire.country == 'America':
-                        year, month, day = fire.date.year, fire.date.month, fire.date.day
-                        latitude, longitude = fire.location
-                        date = f'{year}-{month}-{day}'
+            store = self.wild_fire_store
+            mask = store.country_mask('America')
+
+            for ordinal, latitude, longitude in zip(store.ordinals[mask].tolist(),
+                                                    store.latitudes[mask].tolist(),
+                                                    store.longitudes[mask].tolist()):
+                date = datetime.date.fromordinal(ordinal)
+                date = f'{date.year}-{date.month}-{date.day}'
 
-                        row = [date, latitude, longitude]
-                        writer.writerow(row)
+                row = [date, latitude, longitude]
+                writer.writerow(row)
 
     def write_carbon_emission_data(self, location: str) -> None:
         """Write the carbon emission data to a csv file named location. This removes all the
@@ -283,31 +970,268 @@ class Data:
                 value = self.temperature_deviation[date].temperature_deviance
                 writer.writerow([year, value])
 
-    def _add_fire(self, date: datetime.date, fire: WildFire) -> None:
-        """Mutate the wild_fires dictionary to include the fire that corresponds to date. If the
-        date already exists within the dictionary append the fire, otherwise, create a new key
-        of date with the value of fire.
-
-        Only accept fires that occurred in or after 1950.
-
-        This function is called within get_wild_fires_canada and get_wild_fires_america.
-        """
-
-        if date >= datetime.date(1950, 1, 1):
-            if date in self.wild_fires:
-                self.wild_fires[date].append(fire)
-            else:
-                self.wild_fires[date] = [fire]
-
     def find_first_date(self) -> datetime.date:
         """
         Return the first date entry that appears in self.wild_fires.
         """
-        return min(self.wild_fires)
+        return datetime.date.fromordinal(self.wild_fire_store.first_ordinal())
 
     def find_last_date(self) -> datetime.date:
         """Return the last date entry that appears in self.wild_fires."""
-        return max(self.wild_fires)
+        return datetime.date.fromordinal(self.wild_fire_store.last_ordinal())
+
+
+def _add_fires(store: WildFireStore, cube: WildFireCube, columns: Dict[str, numpy.ndarray],
+               country: str) -> None:
+    """Mutate store and cube to include the fires given by columns, all of which occurred in
+    country.
+
+    Only accept fires that occurred in or after 1950.
+
+    Preconditions:
+        - columns has the format returned by read_cached_wild_fires
+        - country in COUNTRIES
+    """
+    mask = columns['ordinals'] >= _EARLIEST_ORDINAL
+
+    store.add_fires(columns['ordinals'][mask], columns['latitudes'][mask],
+                    columns['longitudes'][mask], country)
+
+    # The counts were made when the columns were read, and only include the same fires.
+    cube.add_counts(country, columns)
+
+
+def read_cached_wild_fires(location: str, reader: Callable[[str], Dict[str, numpy.ndarray]],
+                           cache_directory: Optional[str]) -> Dict[str, numpy.ndarray]:
+    """Return the wildfire columns of the file at location, as read by reader, along with the
+    counts of its fires returned by count_wild_fires.
+
+    The columns are read from the parse cache in cache_directory if it is up to date, otherwise
+    the file is parsed with reader and the result is written to the parse cache. If
+    cache_directory is None, the file is always parsed.
+
+    Preconditions:
+        - reader is read_wild_fires_canada or read_wild_fires_america
+    """
+    if cache_directory is not None:
+        columns = parse_cache.load_columns(location, cache_directory)
+
+        if columns is not None:
+            return columns
+
+    return parse_wild_fires(location, reader, cache_directory)
+
+
+def parse_wild_fires(location: str, reader: Callable[[str], Dict[str, numpy.ndarray]],
+                     cache_directory: Optional[str]) -> Dict[str, numpy.ndarray]:
+    """Parse the file at location with reader and return its wildfire columns, along with the
+    counts of its fires returned by count_wild_fires, without checking the parse cache first.
+
+    The result is written to the parse cache in cache_directory, unless cache_directory is None.
+
+    Preconditions:
+        - reader is read_wild_fires_canada or read_wild_fires_america
+    """
+    columns = reader(location)
+    columns.update(count_wild_fires(columns['ordinals'], columns['latitudes'],
+                                    columns['longitudes']))
+
+    if cache_directory is not None:
+        parse_cache.save_columns(location, columns, cache_directory)
+
+    return columns
+
+
+def count_wild_fires(ordinals: numpy.ndarray, latitudes: numpy.ndarray,
+                     longitudes: numpy.ndarray) -> Dict[str, numpy.ndarray]:
+    """Return the counts that WildFireCube.add_counts adds to a cube for the fires given by
+    the parallel arrays ordinals, latitudes and longitudes, as a dictionary of arrays with keys
+    'cube_first_year', 'cube_daily' and 'cube_regional'.
+
+    Only fires that occurred in or after 1950 are counted, like in Data. Every count is made in
+    one pass over the fires.
+
+    Preconditions:
+        - len(ordinals) == len(latitudes) == len(longitudes)
+    """
+    mask = ordinals >= _EARLIEST_ORDINAL
+    dates = (ordinals[mask].astype(numpy.int64) - _EPOCH_ORDINAL).astype('datetime64[D]')
+
+    years = dates.astype('datetime64[Y]')
+    months = dates.astype('datetime64[M]').astype(numpy.int64) % 12
+    days = (dates - years.astype('datetime64[D]')).astype(numpy.int64)
+    years = years.astype(numpy.int64) + 1970
+
+    rows = numpy.clip(((latitudes[mask] + 90) // _CUBE_CELL_SIZE).astype(numpy.int64),
+                      0, _CUBE_ROWS - 1)
+    columns = numpy.clip(((longitudes[mask] + 180) // _CUBE_CELL_SIZE).astype(numpy.int64),
+                         0, _CUBE_COLUMNS - 1)
+    regions = rows * _CUBE_COLUMNS + columns
+
+    first_year = int(years.min()) if len(years) > 0 else \
+        datetime.date.fromordinal(_EARLIEST_ORDINAL).year
+    year_count = int(years.max()) - first_year + 1 if len(years) > 0 else 0
+    region_count = _CUBE_ROWS * _CUBE_COLUMNS
+
+    # Give every cell of each cube its own bin, so one bincount counts them all.
+    daily = numpy.bincount((years - first_year) * 366 + days, minlength=year_count * 366)
+    regional = numpy.bincount(((years - first_year) * 12 + months) * region_count + regions,
+                              minlength=year_count * 12 * region_count)
+
+    return {'cube_first_year': numpy.array(first_year),
+            'cube_daily': daily.astype(numpy.int32).reshape(year_count, 366),
+            'cube_regional': regional.astype(numpy.int32).reshape(year_count, 12, region_count)}
+
+
+def read_wild_fires_canada(location: str) -> Dict[str, numpy.ndarray]:
+    """Return the wildfire data from canada as a dictionary of parallel arrays, with keys
+    'ordinals', 'latitudes' and 'longitudes'.
+
+    Preconditions:
+        - location is the location of the 'canada_wildfire_data.csv file.
+    """
+
+    with open(location, encoding="utf8") as file:
+        reader = csv.reader(file)
+
+        # Gets the headers of the list, and moves the reader so the header is not included
+        # in the data.
+        headers = next(reader)
+
+        latitude_index = headers.index('LATITUDE')
+        longitude_index = headers.index('LONGITUDE')
+        year_index = headers.index('YEAR')
+        month_index = headers.index('MONTH')
+        day_index = headers.index('DAY')
+
+        years = array.array('i')
+        months = array.array('i')
+        days = array.array('i')
+        latitudes = array.array('d')
+        longitudes = array.array('d')
+
+        for row in reader:
+
+            if int(row[year_index]) != 0 and int(row[month_index]) != 0 \
+                    and int(row[day_index]) != 0:
+                years.append(int(row[year_index]))
+                months.append(int(row[month_index]))
+                days.append(int(row[day_index]))
+                latitudes.append(float(row[latitude_index]))
+                longitudes.append(float(row[longitude_index]))
+
+    ordinals = _dates_to_ordinals(numpy.array(years, dtype=numpy.int64),
+                                  numpy.array(months, dtype=numpy.int64),
+                                  numpy.array(days, dtype=numpy.int64))
+
+    return {'ordinals': ordinals.astype(numpy.int32),
+            'latitudes': numpy.array(latitudes, dtype=numpy.float64),
+            'longitudes': numpy.array(longitudes, dtype=numpy.float64)}
+
+
+def read_wild_fires_america(location: str, chunk_size: int = _CHUNK_SIZE) \
+        -> Dict[str, numpy.ndarray]:
+    """Return the wildfire data from america as a dictionary of parallel arrays, with keys
+    'ordinals', 'latitudes' and 'longitudes'.
+
+    The file is read in blocks of chunk_size rows, and each block is parsed into compact arrays
+    before the next one is read, so only one block of rows is held as Python objects at a time.
+
+    Preconditions:
+        - location is the location of the 'america_wildfire_data.csv' file.
+        - chunk_size > 0
+    """
+
+    with open(location) as file:
+        # Gets the headers of the list, and moves the file so the header is not included
+        # in the data.
+        headers = next(csv.reader([file.readline()]))
+
+        latitude_index = headers.index('LATITUDE')
+        longitude_index = headers.index('LONGITUDE')
+        date_index = headers.index('DISCOVERY_DATE')
+
+        ordinals = []
+        latitudes = []
+        longitudes = []
+
+        lines = list(itertools.islice(file, chunk_size))
+
+        while lines:
+            # Transpose the block of rows into one tuple per column, skipping blank lines.
+            columns = list(zip(*(row for row in csv.reader(lines) if row)))
+
+            if columns:
+                # Stored in the data as "year-month-day"
+                dates = numpy.array('-'.join(columns[date_index]).split('-'),
+                                    dtype=numpy.int64).reshape(-1, 3)
+
+                ordinals.append(_dates_to_ordinals(dates[:, 0], dates[:, 1], dates[:, 2]))
+                latitudes.append(numpy.array(columns[latitude_index], dtype=numpy.float64))
+                longitudes.append(numpy.array(columns[longitude_index], dtype=numpy.float64))
+
+            lines = list(itertools.islice(file, chunk_size))
+
+    return {'ordinals': numpy.concatenate(ordinals or [numpy.empty(0)]).astype(numpy.int32),
+            'latitudes': numpy.concatenate(latitudes or [numpy.empty(0)]),
+            'longitudes': numpy.concatenate(longitudes or [numpy.empty(0)])}
+
+
+def ordinals_to_years(ordinals: numpy.ndarray) -> numpy.ndarray:
+    """Return the year of each of the dates given by the array of proleptic Gregorian ordinals.
+
+    >>> ordinals_to_years(numpy.array([datetime.date(1950, 1, 1).toordinal(),\
+        datetime.date(2016, 12, 31).toordinal()])).tolist()
+    [1950, 2016]
+    """
+    dates = (ordinals.astype(numpy.int64) - _EPOCH_ORDINAL).astype('datetime64[D]')
+    return dates.astype('datetime64[Y]').astype(numpy.int64) + 1970
+
+
+def _dates_to_ordinals(years: numpy.ndarray, months: numpy.ndarray,
+                       days: numpy.ndarray) -> numpy.ndarray:
+    """Return the proleptic Gregorian ordinals of the dates given by the parallel arrays years,
+    months and days.
+
+    Preconditions:
+        - len(years) == len(months) == len(days)
+        - every (years[i], months[i], days[i]) is a valid date
+
+    >>> ordinals = _dates_to_ordinals(numpy.array([1950, 2016]), numpy.array([1, 8]),\
+        numpy.array([4, 28]))
+    >>> [datetime.date.fromordinal(ordinal) for ordinal in ordinals.tolist()]
+    [datetime.date(1950, 1, 4), datetime.date(2016, 8, 28)]
+    """
+    months_since_epoch = (years - 1970) * 12 + (months - 1)
+    dates = months_since_epoch.astype('datetime64[M]').astype('datetime64[D]') + (days - 1)
+    return dates.astype(numpy.int64) + _EPOCH_ORDINAL
+
+
+def _pad_years(counts: numpy.ndarray, before: int, after: int) -> numpy.ndarray:
+    """Return a copy of counts, the counts of a WildFireCube, with before years of zeros added
+    before its first year and after years of zeros added after its last year.
+
+    Preconditions:
+        - before >= 0 and after >= 0
+    """
+    padding = [(0, 0)] * counts.ndim
+    padding[1] = (before, after)
+    return numpy.pad(counts, padding)
+
+
+def _concatenate_ranges(starts: numpy.ndarray, ends: numpy.ndarray) -> numpy.ndarray:
+    """Return the concatenation of range(starts[i], ends[i]) for every i, as an array.
+
+    Preconditions:
+        - len(starts) == len(ends)
+        - all(starts[i] <= ends[i] for i in range(len(starts)))
+
+    >>> _concatenate_ranges(numpy.array([2, 7, 10]), numpy.array([4, 7, 12])).tolist()
+    [2, 3, 10, 11]
+    """
+    lengths = ends - starts
+    offsets = numpy.repeat(starts - numpy.cumsum(lengths) + lengths, lengths)
+    return offsets + numpy.arange(lengths.sum())
 
 
 if __name__ == '__main__':
@@ -317,10 +1241,11 @@ if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['datetime', 'csv', 'python_ta.contracts', 'wildfires',
-                          'carbon_emissions', 'temperature_deviation'],
+        'extra-imports': ['datetime', 'csv', 'array', 'calendar', 'numpy', 'collections.abc',
+                          'concurrent.futures', 'itertools', 'python_ta.contracts', 'wildfires',
+                          'carbon_emissions', 'temperature_deviation', 'parse_cache'],
         # the names (strs) of imported modules
-        'allowed-io': ['get_wild_fires_canada', 'get_wild_fires_america',
+        'allowed-io': ['read_wild_fires_canada', 'read_wild_fires_america',
                        'get_carbon_emission_data', 'get_temperature_deviance_data',
                        'write_canadian_wild_fire_data', 'write_american_wild_fire_data',
                        'write_carbon_emission_data', 'write_temperature_deviance_data'],
@@ -5,12 +5,35 @@ Contains functions for drawing the map onto the screen, along with drawing dots
 
 CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
 """
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import Deque, List, Tuple
+import collections
+import itertools
 import os
+import numpy
 import pygame
 from window import Window
 
 
+@dataclass
+class DotBatch:
+    """A batch of dots, prepared by FireMap.prepare_dots so that it can be added to and removed
+    from the map in time proportional to its size.
+
+    Instance Attributes:
+        - positions: The (x, y) pixel position of each dot, with one row per dot.
+        - sprite_blits: The Surface.blits sequence that draws the dot sprite at every dot.
+        - heat_bins: The flattened index of the heatmap bin of each dot that is on the map.
+
+    Representation Invariants:
+        - len(self.sprite_blits) == len(self.positions)
+        - len(self.heat_bins) <= len(self.positions)
+    """
+    positions: numpy.ndarray
+    sprite_blits: List[Tuple[pygame.Surface, List[int]]]
+    heat_bins: numpy.ndarray
+
+
 class FireMap:
     """
     Wrapper class for the core wildfire map, storing the map image and
@@ -19,9 +42,24 @@ class FireMap:
     """
 
     # Private Instance Attributes:
-    # - _dot_positions: A list of positions to draw dots on the map the next time
-    #                   the map is to be drawn onto the screen.
-    # - _map_image: PyGame Surface containing background image of the map
+    # - _dot_batches: A queue of batches of dots to draw on the map the next time the map is
+    #                 to be drawn onto the screen. Batches are added to the right and removed
+    #                 from the left, so that a sliding window of batches (such as one batch
+    #                 per day) can be kept.
+    # - _heat_counts: The number of dots in each heatmap bin, kept up to date as batches are
+    #                 added and removed.
+    # - _dot_sprite: PyGame Surface containing a single pre-rendered dot.
+    # - _render_mode: How the dots are drawn. Possible values include:
+    #                 "circle": each dot is drawn with its own pygame.draw.circle call
+    #                 "sprite": _dot_sprite is blitted at every dot position with a single
+    #                           Surface.blits call
+    #                 "heatmap": the dots are binned into a 2D histogram, which is colored
+    #                            and drawn as a single image
+    # - _dirty: Whether the map changed since it was last drawn.
+    # - _heat_colormap: An array with one RGBA row for each of the 256 heat levels, used to
+    #                   color the heatmap.
+    # - _map_image: PyGame Surface containing background image of the map, converted to the
+    #               display's pixel format once so it is fast to draw every frame.
     # - _map_surface: PyGame Surface onto which map image and dots will be drawn.
     # - _map_date_text: The string representation of the date that will be drawn.
     # - _MAP_POSITION: The position of the top-left corner of the map image
@@ -29,8 +67,17 @@ class FireMap:
     #                           corners of the map image
     # - _MAP_DATE_LABEL_POSITION: The position of where the date label is to be drawn on the map
     # - _MAP_DOT_RADIUS: The radius of the dots that indicate a fire.
-
-    _dot_positions: List[Tuple[float, float]]
+    # - _MAP_DOT_COLOR: The color of the dots that indicate a fire.
+    # - _HEATMAP_BIN_SIZE: The width and height, in pixels, of each bin of the heatmap.
+    # Private Representation Invariants:
+    # - self._render_mode in {"circle", "sprite", "heatmap"}
+
+    _dot_batches: Deque[DotBatch]
+    _heat_counts: numpy.ndarray
+    _dot_sprite: pygame.Surface
+    _render_mode: str
+    _dirty: bool
+    _heat_colormap: numpy.ndarray
     _map_image: pygame.Surface
     _map_surface: pygame.Surface
     _map_date_text: str
@@ -42,18 +89,41 @@ class FireMap:
     _MAP_COORDINATE_BOUNDS: Tuple[Tuple[int, int], Tuple[int, int]] = ((90, -180), (15, -45))
     _MAP_DATE_LABEL_POSITION: Tuple[int, int] = (0, 0)
     _MAP_DOT_RADIUS: int = 8
+    _MAP_DOT_COLOR: Tuple[int, int, int] = (255, 50, 50)
+    _HEATMAP_BIN_SIZE: int = 4
 
-    def __init__(self) -> None:
+    def __init__(self, render_mode: str = "sprite") -> None:
         """
-        Initialize map image, list of dot positions.
+        Initialize map image, list of dot positions, and the mode the dots are drawn in.
+
+        Preconditions:
+         - render_mode in {"circle", "sprite", "heatmap"}
         """
 
-        # Initialize dot position list
-        self._dot_positions = []
+        # Initialize dot batch queue
+        self._dot_batches = collections.deque()
+        self._render_mode = render_mode
+        self._dirty = True
+
+        # Pre-render a single dot. Black is used as the transparent color key.
+        self._dot_sprite = pygame.Surface((self._MAP_DOT_RADIUS * 2, self._MAP_DOT_RADIUS * 2))
+        pygame.draw.circle(self._dot_sprite, self._MAP_DOT_COLOR,
+                           (self._MAP_DOT_RADIUS, self._MAP_DOT_RADIUS), self._MAP_DOT_RADIUS)
+        self._dot_sprite = self._dot_sprite.convert()
+        self._dot_sprite.set_colorkey((0, 0, 0))
+
+        # Heat levels go from the dot color at low density to yellow at high density, and
+        # become more opaque as they go. Level 0 (no fires) is fully transparent.
+        levels = numpy.linspace(0, 1, 256)
+        self._heat_colormap = numpy.empty((256, 4), dtype=numpy.uint8)
+        self._heat_colormap[:, 0] = 255
+        self._heat_colormap[:, 1] = 50 + 205 * levels
+        self._heat_colormap[:, 2] = 50 * (1 - levels)
+        self._heat_colormap[:, 3] = 120 + 135 * levels
+        self._heat_colormap[0, 3] = 0
 
         # Load the map image
-        self._map_image = pygame.image.load(os.path.join("assets/map.png"))
-        self._map_image.convert()
+        self._map_image = pygame.image.load(os.path.join("assets/map.png")).convert()
 
         # Set a placeholder value for the text.
         self._map_date_text = "Click `Play/Pause`"
@@ -61,20 +131,31 @@ class FireMap:
         # Initialize map surface with size based on image size.
         self._map_surface = pygame.Surface(self._map_image.get_size())
 
+        # Initialize the heatmap bin counts, with enough bins to cover the whole map.
+        self._heat_counts = numpy.zeros(
+            (-(-self._map_surface.get_width() // self._HEATMAP_BIN_SIZE),
+             -(-self._map_surface.get_height() // self._HEATMAP_BIN_SIZE)), dtype=numpy.int32)
+
     def draw(self, window: Window) -> None:
         """
-        Draw background map image, dots to window.
+        Draw background map image, dots to window, and report the area of the window
+        that was drawn over to the window as dirty.
         """
 
-        # Clear the map surface
-        self._map_surface.fill((0, 0, 0))
-
-        # Draw the map image on the map surface
+        # Draw the map image on the map surface. The image covers the whole surface, so this
+        # also clears the dots and text from the last time the map was drawn.
         self._map_surface.blit(self._map_image, (0, 0))
 
         # Draw each dot on the map surface
-        for position in self._dot_positions:
-            pygame.draw.circle(self._map_surface, (255, 50, 50), position, self._MAP_DOT_RADIUS)
+        if self._render_mode == "sprite":
+            self._draw_dot_sprites()
+        elif self._render_mode == "heatmap":
+            self._draw_heatmap()
+        else:
+            for batch in self._dot_batches:
+                for position in batch.positions.tolist():
+                    pygame.draw.circle(self._map_surface, self._MAP_DOT_COLOR, position,
+                                       self._MAP_DOT_RADIUS)
 
         # Draw the date label onto the map
         self._map_surface.blit(window.render_text(text=self._map_date_text, antialias=True,
@@ -83,7 +164,16 @@ class FireMap:
                                self._MAP_DATE_LABEL_POSITION)
 
         # Draw the map surface on the screen
-        window.draw_to_screen(surface=self._map_surface, position=self._MAP_POSITION)
+        window.add_dirty_rect(window.draw_to_screen(surface=self._map_surface,
+                                                    position=self._MAP_POSITION))
+
+        self._dirty = False
+
+    def is_dirty(self) -> bool:
+        """
+        Return whether the map changed since it was last drawn.
+        """
+        return self._dirty
 
     def add_dot(self, coordinates: Tuple[float, float]) -> None:
         """
@@ -93,14 +183,100 @@ class FireMap:
          - coordinates is in the format (latitude, longitude)
         """
 
-        self._dot_positions.append(self._coords_to_pixel(coordinates))
+        self.add_dots(numpy.array([self._coords_to_pixel(coordinates)]))
+
+    def add_dots(self, positions: numpy.ndarray) -> None:
+        """
+        Add a dot to the map at each of the given pixel positions, as computed by
+        coords_to_pixels. The dots are added as one batch, which can later be removed with
+        remove_oldest_dots.
+
+        This takes time proportional to len(positions), not to the number of dots on the map.
+
+        Preconditions:
+         - positions.shape == (len(positions), 2)
+        """
+
+        self.add_dot_batch(self.prepare_dots(positions))
+
+    def prepare_dots(self, positions: numpy.ndarray) -> DotBatch:
+        """
+        Return a batch of dots at each of the given pixel positions, ready to be added to
+        the map with add_dot_batch.
+
+        This does not change the map, so it can be called from a background thread.
+
+        Preconditions:
+         - positions.shape == (len(positions), 2)
+        """
+
+        # Blit positions are the top left corner of the sprite, not the centre of the dot.
+        sprite_blits = list(zip(itertools.repeat(self._dot_sprite),
+                                (positions - self._MAP_DOT_RADIUS).tolist()))
+
+        # Find the heatmap bin of each dot, ignoring any that fall outside of the map.
+        bins_size = self._heat_counts.shape
+        bins = positions // self._HEATMAP_BIN_SIZE
+        inside = (bins[:, 0] >= 0) & (bins[:, 0] < bins_size[0]) \
+            & (bins[:, 1] >= 0) & (bins[:, 1] < bins_size[1])
+
+        return DotBatch(positions=positions, sprite_blits=sprite_blits,
+                        heat_bins=bins[inside, 0] * bins_size[1] + bins[inside, 1])
+
+    def add_dot_batch(self, batch: DotBatch) -> None:
+        """
+        Add a batch of dots prepared by prepare_dots to the map. The batch can later be
+        removed with remove_oldest_dots.
+
+        This takes time proportional to the size of the batch, not to the number of dots
+        on the map.
+        """
+
+        self._dot_batches.append(batch)
+        numpy.add.at(self._heat_counts.reshape(-1), batch.heat_bins, 1)
+        self._dirty = True
+
+    def remove_oldest_dots(self) -> None:
+        """
+        Remove the batch of dots that was added the longest time ago.
+
+        This takes time proportional to the size of that batch, not to the number of dots
+        on the map.
+
+        Preconditions:
+         - at least one batch of dots has been added since the dots were last cleared
+        """
+
+        numpy.subtract.at(self._heat_counts.reshape(-1), self._dot_batches.popleft().heat_bins, 1)
+        self._dirty = True
 
     def clear_dots(self) -> None:
         """
         Clear dots off the map image. This also redraws the map image.
         """
 
-        self._dot_positions.clear()
+        self._dot_batches.clear()
+        self._heat_counts.fill(0)
+        self._dirty = True
+
+    def set_render_mode(self, render_mode: str) -> None:
+        """
+        Set how the dots are drawn, so the rendering paths can be compared.
+
+        Preconditions:
+         - render_mode in {"circle", "sprite", "heatmap"}
+        """
+        self._render_mode = render_mode
+        self._dirty = True
+
+    def _draw_dot_sprites(self) -> None:
+        """
+        Draw every dot onto the map surface by blitting the pre-rendered dot sprite
+        at each dot position in a single Surface.blits call.
+        """
+
+        self._map_surface.blits(itertools.chain.from_iterable(
+            batch.sprite_blits for batch in self._dot_batches), doreturn=False)
 
     def set_map_date_text(self, text: str) -> None:
         """
@@ -109,7 +285,63 @@ class FireMap:
         Preconditions:
          - len(text) > 0
         """
-        self._map_date_text = text
+        if text != self._map_date_text:
+            self._map_date_text = text
+            self._dirty = True
+
+    def _draw_heatmap(self) -> None:
+        """
+        Draw the density of the dots onto the map surface as a heatmap.
+
+        The dots are counted in bins of _HEATMAP_BIN_SIZE pixels, the counts are colored with
+        _heat_colormap, and the result is scaled up and drawn onto the map surface as one
+        image, so the cost of drawing does not depend on the number of dots.
+        """
+
+        counts = self._heat_counts
+
+        if not counts.any():
+            return
+
+        colors = self._heat_colormap[heat_levels(counts)]
+
+        heat_surface = pygame.Surface(counts.shape, pygame.SRCALPHA)
+        pygame.surfarray.blit_array(heat_surface, colors[:, :, :3])
+        alpha = pygame.surfarray.pixels_alpha(heat_surface)
+        alpha[:] = colors[:, :, 3]
+        del alpha  # Unlock the surface
+
+        self._map_surface.blit(pygame.transform.smoothscale(
+            heat_surface, (counts.shape[0] * self._HEATMAP_BIN_SIZE,
+                           counts.shape[1] * self._HEATMAP_BIN_SIZE)), (0, 0))
+
+    def coords_to_pixels(self, latitudes: numpy.ndarray,
+                         longitudes: numpy.ndarray) -> numpy.ndarray:
+        """
+        Return an array of the pixel positions, relative to self._map_image position,
+        of every coordinate given by the parallel arrays latitudes and longitudes.
+
+        Row i of the returned array is the (x, y) pixel position of
+        (latitudes[i], longitudes[i]), computed in the same way as _coords_to_pixel.
+
+        Preconditions:
+         - len(latitudes) == len(longitudes)
+        """
+
+        # Size of the map image in pixels
+        image_size = self._map_image.get_size()
+
+        # Top left and bottom right latitudes and longitudes
+        top_left = self._MAP_COORDINATE_BOUNDS[0]
+        bot_right = self._MAP_COORDINATE_BOUNDS[1]
+
+        positions = numpy.empty((len(latitudes), 2), dtype=numpy.int32)
+        positions[:, 0] = (longitudes - top_left[1]) / (bot_right[1] - top_left[1]) \
+            * image_size[0]
+        positions[:, 1] = (1 - (latitudes - bot_right[0]) / (top_left[0] - bot_right[0])) \
+            * image_size[1]
+
+        return positions
 
     def _coords_to_pixel(self, coordinates: Tuple[float, float]) -> Tuple[int, int]:
         """
@@ -146,11 +378,32 @@ class FireMap:
         return (int(ratio[0] * image_size[0]), int(ratio[1] * image_size[1]))
 
 
+def heat_levels(counts: numpy.ndarray) -> numpy.ndarray:
+    """
+    Return the heat level, from 0 to 255, of each of the heatmap bin counts in counts.
+
+    The counts are scaled logarithmically, so sparse areas are still visible. Only empty bins
+    have level 0, and the densest bins have level 255.
+
+    Preconditions:
+     - counts.any()
+     - (counts >= 0).all()
+
+    >>> heat_levels(numpy.array([[0, 1], [4, 16]])).tolist()
+    [[0, 63], [145, 255]]
+    """
+    levels = numpy.log1p(counts) * (255 / numpy.log1p(counts.max()))
+
+    # Rounding error can put the densest bins slightly above 255.
+    return numpy.minimum(numpy.ceil(levels), 255).astype(numpy.intp)
+
+
 if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['pygame', 'os', 'typing', 'window', 'python_ta.contracts'],
+        'extra-imports': ['pygame', 'os', 'typing', 'collections', 'itertools', 'window',
+                          'numpy', 'dataclasses', 'python_ta.contracts'],
         # the names (strs) of imported modules
         'allowed-io': [],
         # the names (strs) of functions that call print/open/input
@@ -7,9 +7,11 @@ which accesses the wildfire data, plotting it on the FireMap, and animating it.
 CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
 """
 
+from typing import Tuple
 import datetime
 from data import Data
-from firemap import FireMap
+from firemap import DotBatch, FireMap
+from frame_prefetcher import FramePrefetcher
 
 
 class FireMapUpdater:
@@ -20,42 +22,57 @@ class FireMapUpdater:
     # Private Instance Attributes:
     # - _data: Data class instance containing the wildfire, carbon, and temperature deviance data
     # - _map: FireMap class instance that will be used to plot wildfire data onto.
-    # - _date: datetime.date of the current day that is being examined in the data.
+    # - _day: The ordinal (datetime.date.toordinal) of the current day that is being examined
+    #         in the data.
     # - _day_increment: How many days to increment for every update
     # - _day_overlap: How long fires last in days (just so the dots don't instantly dissapear
     #                 on the next day
+    # - _window: The (start, end) ordinals of the days whose fires are currently on the map,
+    #            which are the days start, ..., end - 1. The map holds one batch of dots
+    #            for each of these days, in order.
     # - _update_delay: Number of milliseconds to wait before updating the fire map
-    # - _time_delta_so_far: Number of milliseconds elapsed since the last update
+    # - _time_delta_so_far: Number of milliseconds elapsed that have not yet been turned into
+    #                       days of the timelapse
     # - _animating: whether the timelapse is animating, and whether the map should be updated.
-    # - _last_date: The last date of the timelapse
-    # - _first_date: The last date of the timelapse
+    # - _last_day: The ordinal of the last date of the timelapse
+    # - _first_day: The ordinal of the first date of the timelapse
+    # - _prefetcher: Prepares the dot batches of the days entering the window ahead of time,
+    #                in a background thread.
     # - _DEFAULT_UPDATE_DELAY: The default number of milliseconds to wait before
     #                          updating the fire map.
+    # - _PREFETCH_DAYS: The maximum number of days prepared ahead of the window.
     # Private Representation Invariants:
     # - self._day_increment > 0
     # - self._update_delay > 0
     _data: Data
     _map: FireMap
-    _date: datetime.date
+    _day: int
     _day_increment: int
     _fire_duration: int
+    _window: Tuple[int, int]
     _update_delay: float
     _time_delta_so_far: float
     _animating: bool
 
-    _last_date: datetime.date
-    _first_date: datetime.date
+    _last_day: int
+    _first_day: int
+    _prefetcher: FramePrefetcher
 
     _DEFAULT_UPDATE_DELAY: float = 8
+    _PREFETCH_DAYS: int = 128
 
     def __init__(self, data: Data, firemap: FireMap) -> None:
         """Initialize instances"""
         self._data = data
         self._map = firemap
 
-        self._first_date = data.find_first_date()
-        self._last_date = data.find_last_date()
-        self._date = self._first_date
+        # Project every fire onto the map once, instead of every time it is drawn.
+        data.wild_fire_store.project(firemap.coords_to_pixels)
+
+        self._first_day = data.wild_fire_store.first_ordinal()
+        self._last_day = data.wild_fire_store.last_ordinal()
+        self._day = self._first_day
+        self._window = (self._first_day, self._first_day)
 
         self._day_increment = 1
         self._fire_duration = 7
@@ -64,50 +81,89 @@ class FireMapUpdater:
 
         self._animating = True
 
+        # Build the store's day index now, so the prefetcher's thread only ever reads it.
+        data.wild_fire_store.fires_between(self._first_day, self._first_day)
+
+        self._prefetcher = FramePrefetcher(self._prepare_day, self._first_day,
+                                           self._last_day, self._PREFETCH_DAYS)
+
+    def _prepare_day(self, day: int) -> DotBatch:
+        """
+        Return the dot batch of the fires on the day with ordinal day.
+
+        This does not change the map, so it is safe to call from the prefetcher's thread.
+        """
+        store = self._data.wild_fire_store
+        return self._map.prepare_dots(store.pixels[store.fires_between(day, day + 1)])
+
     def _draw_wildfire_dots(self) -> None:
         """
         Draw the corresponding date's wildfire dots onto the firemap.
         This will draw the dots for the data for the number of days
         specified by self._fire_duration.
+
+        The window of days on the map is slid forward rather than rebuilt: the days that
+        left the window are removed and the days that entered it are added, so advancing
+        by one day only costs as much as one day's fires. When the timelapse skips past the
+        whole window, only the new window's days are looked at. The days that enter the window
+        are usually already prepared by the prefetcher.
         """
 
-        starting_date = self._date - datetime.timedelta(days=self._fire_duration + 1)
+        starting_day = max(self._day - self._fire_duration - 1, self._first_day)
+        new_window = (starting_day, starting_day + self._fire_duration)
 
-        if starting_date < self._first_date:
-            starting_date = self._first_date
+        # The first day that is taken from the prefetcher rather than prepared here.
+        first_prefetched_day = self._window[1]
 
-        for date in [starting_date + datetime.timedelta(days=n)
-                     for n in range(self._fire_duration)]:
-            if date in self._data.wild_fires:
-                for fire in self._data.wild_fires[date]:
-                    self._map.add_dot(fire.location)
+        # The day to restart the prefetcher from once the window is drawn, if any.
+        next_prefetched_day = None
 
-    def _increment_date(self, multiplier: float) -> None:
-        """Increment the date by self._day_increment, with an optional multiplier \
-        (if frames are skipped).
+        if new_window[0] > self._window[1]:
+            # The timelapse is fast-forwarding past the whole window, so rebuild it. The
+            # prefetcher was told to prepare this window by the last update; assume the next
+            # update will jump as far again and have it prepare that window next.
+            self._map.clear_dots()
+            first_prefetched_day = new_window[0]
+            next_prefetched_day = new_window[0] + (new_window[0] - self._window[0])
+            self._window = (new_window[0], new_window[0])
+        elif new_window[0] < self._window[0]:
+            # The window moved backwards, so rebuild it. The prefetcher starts over after
+            # the new window.
+            self._map.clear_dots()
+            first_prefetched_day = new_window[1]
+            self._prefetcher.seek(first_prefetched_day)
+            self._window = (new_window[0], new_window[0])
 
-        Preconditions:
-        - multiplier > 0
-        """
-        self._date += datetime.timedelta(days=self._day_increment * multiplier)
+        for _ in range(self._window[0], new_window[0]):
+            self._map.remove_oldest_dots()
 
-        # Check if the date is later than the last date of the timelapse. If so,
-        # Stop the timelapse and set date to the last date.
-        if self._date > self._last_date:
-            self._date = self._last_date
-            self.stop_animation()
+        for day in range(self._window[1], new_window[1]):
+            if day >= first_prefetched_day:
+                batch = self._prefetcher.take(day)
+            else:
+                batch = None
+
+            if batch is None:
+                batch = self._prepare_day(day)
+
+            self._map.add_dot_batch(batch)
+
+        self._window = new_window
+
+        if next_prefetched_day is not None:
+            self._prefetcher.seek(next_prefetched_day)
 
     def _update_map(self) -> None:
         """Update the map by incrementing the date and redrawing the dots."""
-        self._map.set_map_date_text(str(self._date))
+        self._map.set_map_date_text(str(datetime.date.fromordinal(self._day)))
 
-        self._map.clear_dots()
         self._draw_wildfire_dots()
 
     def update_delta(self, delta: float) -> bool:
         """
-        Increment self._time_delta_so_far by delta, and, if the accumulator delta
-        is greater than the time interval before updating the map, update the map as well.
+        Increment self._time_delta_so_far by delta, and advance the timelapse by however many
+        whole days fit in the accumulated time at the current speed. The leftover time is kept
+        for the next update, so the timelapse plays at the same rate at any frame rate.
 
         Return whether the map was updated.
 
@@ -121,19 +177,64 @@ class FireMapUpdater:
         self._time_delta_so_far += delta
 
         if self._time_delta_so_far >= self._update_delay:
+            updates = int(self._time_delta_so_far // self._update_delay)
+            self._time_delta_so_far -= updates * self._update_delay
 
-            # Increment the date
-            self._increment_date(self._time_delta_so_far // self._update_delay)
-
-            self._time_delta_so_far = 0
-
-            # Update the map here
-            self._update_map()
+            self.advance(updates * self._day_increment)
 
             return True
         else:
             return False
 
+    def advance(self, days: int) -> None:
+        """
+        Move the timelapse forward by days and redraw the dots for the new date. If this
+        goes past the last date of the timelapse, stop at the last date and stop the
+        animation.
+
+        Only the days in the fire window around the new date are looked at, so this takes
+        the same time however large days is.
+
+        Preconditions:
+         - days >= 0
+        """
+        self._day += days
+
+        # Check if the date is later than the last date of the timelapse. If so,
+        # Stop the timelapse and set date to the last date.
+        if self._day > self._last_day:
+            self._day = self._last_day
+            self.stop_animation()
+
+        self._update_map()
+
+    def seek(self, date: datetime.date) -> None:
+        """
+        Jump the timelapse to date and redraw the dots for that date, without waiting for
+        the animation to get there. Dates outside of the timelapse are moved to its first or
+        last date. Whether the timelapse is animating is not changed.
+
+        The fires around date are looked up with the data's day index, so this takes
+        O(log n) time in the number of fires, plus the time to draw them.
+        """
+
+        self._day = min(max(date.toordinal(), self._first_day), self._last_day)
+        self._time_delta_so_far = 0
+        self._update_map()
+
+    def get_date(self) -> datetime.date:
+        """
+        Return the current date of the timelapse.
+        """
+        return datetime.date.fromordinal(self._day)
+
+    def get_date_range(self) -> Tuple[datetime.date, datetime.date]:
+        """
+        Return the first and last dates of the timelapse.
+        """
+        return (datetime.date.fromordinal(self._first_day),
+                datetime.date.fromordinal(self._last_day))
+
     def start_animation(self) -> None:
         """
         Start the timelapse.
@@ -157,10 +258,23 @@ class FireMapUpdater:
         Additionally, stop the animation.
         """
 
-        self._date = self._first_date
+        self._day = self._first_day
         self.stop_animation()
         self._update_map()
 
+    def get_prefetch_stats(self) -> Tuple[int, int]:
+        """
+        Return the number of days whose dots were already prepared by the prefetcher when
+        they were needed, and the number of days that had to be prepared on the spot.
+        """
+        return (self._prefetcher.hits, self._prefetcher.misses)
+
+    def close(self) -> None:
+        """
+        Stop the prefetcher's background thread.
+        """
+        self._prefetcher.close()
+
     def set_animation_speed(self, speed: float) -> None:
         """
         Update the time interval between updates based on the speed (multiplier).
@@ -176,7 +290,8 @@ if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['data', 'firemap', 'wildfires', 'datetime', 'python_ta.contracts'],
+        'extra-imports': ['data', 'firemap', 'frame_prefetcher', 'typing', 'datetime',
+                          'python_ta.contracts'],
         # the names (strs) of imported modules
         'allowed-io': [],
         # the names (strs) of functions that call print/open/input
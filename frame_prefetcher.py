@@ -0,0 +1,205 @@
+"""
+frame_prefetcher.py
+
+Contains the FramePrefetcher class, which prepares the dots for upcoming days of the timelapse
+in a background thread, ahead of when they are needed.
+
+CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
+"""
+
+from typing import Callable, Deque, Optional, Tuple
+import collections
+import threading
+from firemap import DotBatch
+
+
+class FramePrefetcher:
+    """
+    Class that prepares the dot batch of each day ahead of the timelapse's playhead in a
+    background thread, keeping up to a fixed number of prepared days in a queue.
+
+    Instance Attributes:
+     - hits: The number of days that were taken from the queue already prepared.
+     - misses: The number of days that were not prepared in time, and had to be prepared
+               by the caller instead.
+
+    Representation Invariants:
+     - self.hits >= 0
+     - self.misses >= 0
+    """
+
+    hits: int
+    misses: int
+
+    # Private Instance Attributes:
+    # - _prepare: Function that returns the dot batch for the day with the given ordinal.
+    # - _last_day: The ordinal of the last day that will be prepared.
+    # - _max_days: The maximum number of prepared days kept in the queue.
+    # - _prepared: The queue of (day ordinal, dot batch) pairs that have been prepared, in
+    #              order of consecutive days.
+    # - _next_day: The ordinal of the next day that the background thread will prepare.
+    # - _preparing: The ordinal of the day that the background thread is preparing, or None
+    #               if it is not preparing a day.
+    # - _generation: Incremented whenever the queue is reset, so that a day that was being
+    #                prepared before the reset is thrown away.
+    # - _running: Whether the background thread should keep running.
+    # - _condition: Lock and condition variable guarding the attributes above.
+    # - _thread: The background thread.
+    # Private Representation Invariants:
+    # - self._max_days > 0
+    # - len(self._prepared) <= self._max_days
+    _prepare: Callable[[int], DotBatch]
+    _last_day: int
+    _max_days: int
+    _prepared: Deque[Tuple[int, DotBatch]]
+    _next_day: int
+    _preparing: Optional[int]
+    _generation: int
+    _running: bool
+    _condition: threading.Condition
+    _thread: threading.Thread
+
+    def __init__(self, prepare: Callable[[int], DotBatch], first_day: int, last_day: int,
+                 max_days: int) -> None:
+        """
+        Initialize the queue and start preparing days from first_day up to last_day,
+        keeping at most max_days prepared at a time.
+
+        Preconditions:
+         - prepare is safe to call from a background thread
+         - first_day <= last_day
+         - max_days > 0
+        """
+        self.hits = 0
+        self.misses = 0
+
+        self._prepare = prepare
+        self._last_day = last_day
+        self._max_days = max_days
+        self._prepared = collections.deque()
+        self._next_day = first_day
+        self._preparing = None
+        self._generation = 0
+        self._running = True
+        self._condition = threading.Condition()
+
+        # A daemon thread does not stop the program from exiting.
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def take(self, day: int) -> Optional[DotBatch]:
+        """
+        Return the prepared dot batch of the day with ordinal day and remove it from the
+        queue, or return None if it has not been prepared yet.
+
+        Days before day are assumed to be no longer needed and are thrown away. If the
+        background thread is preparing day, or is about to, wait for it rather than have the
+        caller prepare day as well. On a miss, the background thread skips ahead to prepare
+        the days after day, unless it has already prepared or is preparing the days soon after.
+        """
+        with self._condition:
+            while self._prepared and self._prepared[0][0] < day:
+                self._prepared.popleft()
+
+            while self._thread.is_alive() and (self._preparing == day
+                                               or self._next_day == day <= self._last_day):
+                self._condition.wait()
+
+            if self._prepared and self._prepared[0][0] == day:
+                self.hits += 1
+                self._condition.notify()
+                return self._prepared.popleft()[1]
+
+            self.misses += 1
+
+            # Resetting throws away the prepared days, so keep them if they are the days
+            # soon after day.
+            first_prepared_day = self._prepared[0][0] if self._prepared else self._next_day
+            if not day < first_prepared_day <= day + self._max_days:
+                self._reset(day + 1)
+
+            return None
+
+    def seek(self, day: int) -> None:
+        """
+        Throw away every prepared day and start preparing days from the day with ordinal day.
+        """
+        with self._condition:
+            self._reset(day)
+
+    def close(self) -> None:
+        """
+        Stop the background thread and wait for it to finish.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+        self._thread.join()
+
+    def _reset(self, day: int) -> None:
+        """
+        Throw away every prepared day and start preparing days from the day with ordinal day.
+
+        Preconditions:
+         - self._condition is held by the caller
+        """
+        self._prepared.clear()
+        self._next_day = day
+        self._generation += 1
+        self._condition.notify()
+
+    def _run(self) -> None:
+        """
+        Body of the background thread: prepare consecutive days until stopped, waiting
+        whenever the queue is full or every day has been prepared.
+        """
+        while True:
+            with self._condition:
+                while self._running and (len(self._prepared) >= self._max_days
+                                         or self._next_day > self._last_day):
+                    self._condition.wait()
+
+                if not self._running:
+                    return
+
+                day = self._next_day
+                generation = self._generation
+                self._preparing = day
+
+            # Prepare the day without holding the lock, so take() is only blocked by it when
+            # it is waiting for this day.
+            batch = None
+            try:
+                batch = self._prepare(day)
+            finally:
+                with self._condition:
+                    self._preparing = None
+
+                    if batch is not None and generation == self._generation:
+                        self._prepared.append((day, batch))
+                        self._next_day = day + 1
+
+                    # Wake take() if it is waiting for this day.
+                    self._condition.notify()
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['typing', 'collections', 'threading', 'firemap', 'python_ta.contracts'],
+        # the names (strs) of imported modules
+        'allowed-io': [],
+        # the names (strs) of functions that call print/open/input
+        'max-line-length': 100,
+        'disable': ['R1705', 'C0200']
+    })
+
+    import python_ta.contracts
+
+    python_ta.contracts.check_all_contracts()
+
+    import doctest
+
+    doctest.testmod()
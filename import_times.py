@@ -0,0 +1,134 @@
+"""
+import_times.py
+
+Report how long each module takes to import when the program starts, so that changes which
+slow down startup can be noticed. Run this file directly to print the report.
+
+CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
+"""
+
+from typing import List, NamedTuple
+import os
+import subprocess
+import sys
+
+# Modules that are slow to import and must only be imported once a plot is rendered, never
+# while the program starts.
+DEFERRED_MODULES = ('matplotlib', 'pylab')
+
+
+class ImportTime(NamedTuple):
+    """
+    The time taken to import one module, as reported by python -X importtime.
+
+    Instance Attributes:
+     - name: The full name of the module.
+     - depth: How deeply nested the import was: 0 for the module that was imported directly,
+              1 for a module it imported, and so on.
+     - self_time: The microseconds spent importing the module, excluding the modules it
+                  imported.
+     - cumulative_time: The microseconds spent importing the module, including the modules it
+                        imported.
+
+    Representation Invariants:
+     - self.depth >= 0
+     - 0 <= self.self_time <= self.cumulative_time
+    """
+    name: str
+    depth: int
+    self_time: int
+    cumulative_time: int
+
+
+def measure_imports(module: str = 'main') -> List[ImportTime]:
+    """
+    Import module in a new Python interpreter and return the time taken to import it and every
+    module it imported, in the order their imports finished. The modules imported while the
+    interpreter itself starts are left out.
+    """
+    # Run from this file's directory, so the program's modules are found from anywhere.
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            universal_newlines=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    import_times = parse_import_times(result.stderr)
+
+    # module is the last import to finish, and the modules it imported finished right before
+    # it, after every other import at depth 0.
+    start = len(import_times) - 1
+    while start > 0 and import_times[start - 1].depth > 0:
+        start -= 1
+
+    return import_times[start:]
+
+
+def parse_import_times(output: str) -> List[ImportTime]:
+    """
+    Return the import times listed in output, the standard error of python -X importtime.
+
+    >>> parse_import_times('import time: self [us] | cumulative | imported package\\n'
+    ...                    'import time:       120 |        120 |   numpy.core\\n'
+    ...                    'import time:        80 |        200 | numpy\\n')
+    [ImportTime(name='numpy.core', depth=1, self_time=120, cumulative_time=120), \
+ImportTime(name='numpy', depth=0, self_time=80, cumulative_time=200)]
+    """
+    import_times = []
+
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        self_time, cumulative_time, name = line[len('import time:'):].split('|')
+
+        if not self_time.strip().isdigit():
+            # The header line
+            continue
+
+        # Each level of nesting is indented by two more spaces.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+
+        import_times.append(ImportTime(name.strip(), depth, int(self_time), int(cumulative_time)))
+
+    return import_times
+
+
+def print_report(import_times: List[ImportTime], count: int = 15) -> bool:
+    """
+    Print the total import time, the time taken by each module imported directly by the
+    imported module, the count slowest modules by their own import time, and whether any of
+    DEFERRED_MODULES were imported.
+
+    Return whether none of DEFERRED_MODULES were imported.
+
+    Preconditions:
+     - import_times != []
+     - count > 0
+    """
+    total = import_times[-1]
+    print(f'Importing {total.name} took {total.cumulative_time / 1000:.1f} ms.')
+
+    print('\nModules imported directly:')
+    for import_time in import_times:
+        if import_time.depth == 1:
+            print(f'  {import_time.cumulative_time / 1000:8.1f} ms  {import_time.name}')
+
+    print(f'\nSlowest {count} modules, excluding the modules they imported:')
+    for import_time in sorted(import_times, key=lambda i: i.self_time, reverse=True)[:count]:
+        print(f'  {import_time.self_time / 1000:8.1f} ms  {import_time.name}')
+
+    deferred = [import_time.name for import_time in import_times
+                if import_time.name.split('.')[0] in DEFERRED_MODULES]
+
+    if deferred:
+        print(f'\nThese modules should only be imported to render a plot: {", ".join(deferred)}')
+    else:
+        print(f'\nNone of {", ".join(DEFERRED_MODULES)} were imported.')
+
+    return not deferred
+
+
+if __name__ == '__main__':
+    # Exit with a non-zero status if a deferred module was imported, so this can be used as
+    # a check.
+    sys.exit(0 if print_report(measure_imports()) else 1)
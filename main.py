@@ -32,9 +32,12 @@ if __name__ == "__main__":
 
     plot_manager = PlotManager(window=window, data=data)
 
+    # Render the plots in the background, so the "View Plot" buttons respond instantly
+    plot_manager.start_prerendering()
+
     add_buttons(window, firemap_updater, plot_manager)
 
-    add_sliders(window)
+    add_sliders(window, firemap_updater)
 
     # Window loop
     while window.is_running():
@@ -53,24 +56,36 @@ if __name__ == "__main__":
 
         """ DRAW STUFF """
 
-        # Draw the background first!!!!
-        window.draw_background()
+        # Only redraw the whole frame if something outside of the map changed.
+        if plot_manager.is_dirty():
+            window.mark_dirty()
+
+        if window.is_dirty():
 
-        # Draw the buttons etc.
-        window.draw_ui()
+            # Draw the background first!!!!
+            window.draw_background()
 
-        if plot_manager.is_plot_displayed():
+            # Draw the buttons etc.
+            window.draw_ui()
+
+            # Draw the plot, if one is displayed
             plot_manager.draw_plot()
 
-        else:
-            # Draw the map stuff (image, dots)
-            firemap.draw(window)
+            if not plot_manager.is_plot_displayed():
+                # Draw the map stuff (image, dots)
+                firemap.draw(window)
 
-            # Draw the UI text
-            draw_ui_text(window)
+                # Draw the UI text
+                draw_ui_text(window)
+
+        elif not plot_manager.is_plot_displayed() and firemap.is_dirty():
+
+            # Only the map changed, so only the map's area has to be redrawn and updated
+            firemap.draw(window)
 
         # Draw the rest of the stuff and update the window!
         window.update()
 
-    # Once loop ends, quit pygame.
+    # Once loop ends, stop the background thread and quit pygame.
+    firemap_updater.close()
     pygame.quit()
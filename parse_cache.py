@@ -0,0 +1,122 @@
+"""
+parse_cache.py:
+Contains functions for caching parsed wildfire data on disk, so that the wildfire CSV files only
+need to be parsed again when they change.
+
+CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
+"""
+
+from typing import Dict, Optional
+import hashlib
+import os
+import zipfile
+import numpy
+
+# The default directory that cache files are stored in.
+CACHE_DIRECTORY: str = '.cache'
+
+# Increment this whenever the format of the cached columns changes, so that old cache files
+# are rebuilt instead of being read incorrectly.
+_CACHE_VERSION: int = 2
+
+# The number of bytes read at a time when hashing a source file.
+_HASH_BLOCK_SIZE: int = 1 << 20
+
+
+def load_columns(source: str, cache_directory: str = CACHE_DIRECTORY) \
+        -> Optional[Dict[str, numpy.ndarray]]:
+    """Return the columns that were cached for the file at source, or None if there is no
+    cache file for source or the cache file is out of date.
+
+    The cache is out of date if the size of source changed, or if its modification time changed
+    and its contents hash no longer matches the hash that was cached.
+    """
+    path = _cache_path(source, cache_directory)
+
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with numpy.load(path) as cache:
+            columns = {name: cache[name] for name in cache.files}
+    except (OSError, ValueError, zipfile.BadZipFile):
+        # A corrupt or partially written cache file is treated as a miss.
+        return None
+
+    metadata = columns.pop('_metadata', None)
+    stat = os.stat(source)
+
+    if metadata is None or len(metadata) != 4 or int(metadata[0]) != _CACHE_VERSION \
+            or int(metadata[1]) != stat.st_size:
+        return None
+
+    if int(metadata[2]) != stat.st_mtime_ns:
+        # The file was touched, but its contents may not have changed.
+        if int(metadata[3], 16) != int(_file_hash(source), 16):
+            return None
+
+        # Refresh the modification time so the file does not need to be hashed next time.
+        save_columns(source, columns, cache_directory)
+
+    return columns
+
+
+def save_columns(source: str, columns: Dict[str, numpy.ndarray],
+                 cache_directory: str = CACHE_DIRECTORY) -> None:
+    """Write columns, which were parsed from the file at source, to the cache.
+
+    Preconditions:
+        - '_metadata' not in columns
+    """
+    os.makedirs(cache_directory, exist_ok=True)
+
+    stat = os.stat(source)
+    metadata = numpy.array([str(_CACHE_VERSION), str(stat.st_size), str(stat.st_mtime_ns),
+                            _file_hash(source)])
+
+    path = _cache_path(source, cache_directory)
+    temporary_path = path + '.tmp'
+
+    # Write to a temporary file first, so an interrupted write never leaves a corrupt cache.
+    with open(temporary_path, 'wb') as file:
+        numpy.savez(file, _metadata=metadata, **columns)
+
+    os.replace(temporary_path, path)
+
+
+def _cache_path(source: str, cache_directory: str) -> str:
+    """Return the path of the cache file for the file at source."""
+    source_id = hashlib.sha1(os.path.abspath(source).encode('utf8')).hexdigest()[:8]
+    return os.path.join(cache_directory, f'{os.path.basename(source)}.{source_id}.npz')
+
+
+def _file_hash(source: str) -> str:
+    """Return the hexadecimal SHA-1 hash of the contents of the file at source."""
+    file_hash = hashlib.sha1()
+
+    with open(source, 'rb') as file:
+        for block in iter(lambda: file.read(_HASH_BLOCK_SIZE), b''):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['typing', 'hashlib', 'os', 'zipfile', 'numpy', 'python_ta.contracts'],
+        # the names (strs) of imported modules
+        'allowed-io': ['save_columns', '_file_hash'],
+        # the names (strs) of functions that call print/open/input
+        'max-line-length': 100,
+        'disable': ['R1705', 'C0200']
+    })
+
+    import python_ta.contracts
+
+    python_ta.contracts.check_all_contracts()
+
+    import doctest
+
+    doctest.testmod()
@@ -4,35 +4,114 @@ Contains the method used to plot the data and the methods to collect the data po
 CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
 """
 import datetime
-from typing import Dict, List, Tuple
-import matplotlib
-import matplotlib.backends.backend_agg as agg
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import os
+import numpy
 import pygame
 from carbon_emissions import CarbonEmission
 from temperature_deviation import TemperatureDeviance
-from wildfires import WildFire
+from data import COUNTRIES, WildFireCube
+import parse_cache
 
-# import pylab must be placed below this line or there is an error
-matplotlib.use("Agg")
-import pylab
+# The size of a rendered plot in pixels, and its resolution in dots per inch.
+_PLOT_SIZE: Tuple[int, int] = (800, 600)
+_PLOT_DPI: int = 85
 
+# Increment this whenever the way plots are drawn changes, so that plots cached on disk are
+# rendered again instead of showing the old drawing.
+_PLOT_CACHE_VERSION: int = 1
 
-def get_plot(line1: List[list], line2: List[list],
-             y1_label: str, y2_label: str, title: str) -> pygame.Surface:
+
+def get_plot(line1: Tuple[numpy.ndarray, numpy.ndarray],
+             line2: Tuple[numpy.ndarray, numpy.ndarray],
+             y1_label: str, y2_label: str, title: str, x_label: str = 'Year',
+             annotation: str = '',
+             cache_directory: Optional[str] = parse_cache.CACHE_DIRECTORY) -> pygame.Surface:
+    """
+    Plot a labelled graph of two lines which share an x-axis labelled x_label,
+    and return the surface that it is plotted on. If annotation is not empty, it is written
+    below the graph.
+
+    The rendered plot is saved in cache_directory, named by a hash of everything it is drawn
+    from, and loaded from there the next time the same plot is needed, even by a later run.
+    matplotlib is only imported if the plot has to be rendered. If cache_directory is None,
+    the plot is always rendered and never saved.
+
+    pylab is not thread-safe, so only one call to this function may run at a time.
+
+    Preconditions:
+        - len(line1[0]) == len(line1[1])
+        - len(line2[0]) == len(line2[1])
+    """
+    if cache_directory is None:
+        return _render_plot(line1, line2, y1_label, y2_label, title, x_label, annotation)
+
+    plot_hash = _plot_hash(line1, line2, y1_label, y2_label, title, x_label, annotation)
+    path = os.path.join(cache_directory, f'plot.{plot_hash}.png')
+
+    if os.path.exists(path):
+        try:
+            return pygame.image.load(path)
+        except pygame.error:
+            # A corrupt cache file is rendered and saved again.
+            pass
+
+    surf = _render_plot(line1, line2, y1_label, y2_label, title, x_label, annotation)
+
+    os.makedirs(cache_directory, exist_ok=True)
+
+    # Save to a temporary file first, so an interrupted save never leaves a corrupt plot.
+    temporary_path = path[:-len('.png')] + '.tmp.png'
+    pygame.image.save(surf, temporary_path)
+    os.replace(temporary_path, path)
+
+    return surf
+
+
+def _plot_hash(line1: Tuple[numpy.ndarray, numpy.ndarray],
+               line2: Tuple[numpy.ndarray, numpy.ndarray],
+               y1_label: str, y2_label: str, title: str, x_label: str, annotation: str) -> str:
+    """Return the hexadecimal SHA-1 hash of everything the plot with the given arguments is
+    drawn from, including its size.
+    """
+    plot_hash = hashlib.sha1(repr((_PLOT_CACHE_VERSION, _PLOT_SIZE, _PLOT_DPI,
+                                   y1_label, y2_label, title, x_label,
+                                   annotation)).encode('utf8'))
+
+    for array in (line1[0], line1[1], line2[0], line2[1]):
+        array = numpy.ascontiguousarray(array)
+        plot_hash.update(f'{array.dtype.str}{array.shape}'.encode('utf8'))
+        plot_hash.update(array.tobytes())
+
+    return plot_hash.hexdigest()
+
+
+def _render_plot(line1: Tuple[numpy.ndarray, numpy.ndarray],
+                 line2: Tuple[numpy.ndarray, numpy.ndarray],
+                 y1_label: str, y2_label: str, title: str, x_label: str,
+                 annotation: str) -> pygame.Surface:
     """
-    Plot a labelled graph of two lines which share an x-axis,
-    and return the surface that it is plotted on.
+    Render the plot described in get_plot with matplotlib, and return the surface that it is
+    plotted on.
 
     Preconditions:
-        - len(line1) == 2 and len(line2) == 2
         - len(line1[0]) == len(line1[1])
         - len(line2[0]) == len(line2[1])
     """
+    # matplotlib takes longer to import than everything else, so it is only imported once a
+    # plot actually has to be rendered.
+    import matplotlib
+    import matplotlib.backends.backend_agg as agg
+
+    # import pylab must be placed below this line or there is an error
+    matplotlib.use("Agg")
+    import pylab
 
     # Create pylab figure
-    fig = pylab.figure(figsize=[800 / 85, 600 / 85],  # Inches. This is done so the final plot
-                       # ends up being 800x600px.
-                       dpi=85,  # Dots per inch
+    fig = pylab.figure(figsize=[_PLOT_SIZE[0] / _PLOT_DPI, _PLOT_SIZE[1] / _PLOT_DPI],
+                       # Inches. This is done so the final plot ends up being _PLOT_SIZE px.
+                       dpi=_PLOT_DPI,  # Dots per inch
                        )
 
     # Create plot
@@ -45,7 +124,7 @@ def get_plot(line1: List[list], line2: List[list],
     ax.set_title(title)
 
     # Set x axis label
-    ax.set_xlabel('Year')
+    ax.set_xlabel(x_label)
 
     # Set y axis labels
     ax.set_ylabel(y1_label)
@@ -65,94 +144,108 @@ def get_plot(line1: List[list], line2: List[list],
     # Set axis 2 tick label color to be red.
     ax2.tick_params(color='r')
 
+    # Write the annotation below the plot, making room for it first
+    if annotation != '':
+        fig.subplots_adjust(bottom=0.22)
+        fig.text(0.5, 0.03, annotation, ha='center', va='bottom', fontsize=9)
+
     # Draw the plot
     canvas = agg.FigureCanvasAgg(fig)
     canvas.draw()
 
-    # Render the plot
-    renderer = canvas.get_renderer()
-
-    # Convert the plot into raw RGB data
-    raw_data = renderer.tostring_rgb()
-
     size = canvas.get_width_height()
 
-    # Create a new pygame.Surface from the raw data
-    surf = pygame.image.fromstring(raw_data, size, "RGB")
+    if hasattr(canvas, 'buffer_rgba'):
+        # Create a new pygame.Surface that shares the canvas's RGBA data, without copying it
+        surf = pygame.image.frombuffer(memoryview(canvas.buffer_rgba()), size, "RGBA")
+    else:
+        # Older versions of matplotlib can only convert the plot into a copy of its RGB data
+        surf = pygame.image.fromstring(canvas.get_renderer().tostring_rgb(), size, "RGB")
+
+    # Close the figure, since pylab keeps every open figure alive otherwise
+    pylab.close(fig)
 
     return surf
 
 
-def get_data_points_wild_fires(wild_fire_dict: Dict[datetime.date, List[WildFire]], country: str) \
-        -> List[list]:
+def get_data_points_wild_fires(wild_fire_cube: WildFireCube, country: str) \
+        -> Tuple[numpy.ndarray, numpy.ndarray]:
     """Return the x and y coordinates of the wildfire data points
+
+    The counts are read from wild_fire_cube, which has them precomputed.
+
     Preconditions:
-        - country == 'Canada' or country == 'America'
+        - country in COUNTRIES
     """
-    min_year = min([x.year for x in wild_fire_dict])
-    max_year = max([x.year for x in wild_fire_dict])
-    x_axis = list(range(min_year, max_year + 1))
-    y_axis = [sum([len([fire for fire in wild_fire_dict[x] if fire.country == country])
-                   for x in wild_fire_dict if x.year == y]) for y in x_axis]
-    processed_data = remove_zero_data_points(x_axis, y_axis)
-    return [processed_data[0], processed_data[1]]
+    years, counts = wild_fire_cube.count_per_year()
+    return remove_zero_data_points(years, counts[COUNTRIES.index(country)])
+
+
+def get_data_points_wild_fires_monthly(wild_fire_cube: WildFireCube, country: str) \
+        -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Return the x and y coordinates of the data points of the number of wildfires during
+    each month of the year (where 1 is January), over every year.
+
+    Preconditions:
+        - country in COUNTRIES
+    """
+    counts = wild_fire_cube.count_per_month()[1][COUNTRIES.index(country)].sum(axis=0)
+    return remove_zero_data_points(numpy.arange(1, 13), counts)
 
 
 def get_data_points_temp(temp_dict: Dict[datetime.date, TemperatureDeviance]) \
-        -> List[list]:
+        -> Tuple[numpy.ndarray, numpy.ndarray]:
     """Return the x and y coordinates of the temperature data points
     """
-    min_year = min([x.year for x in temp_dict])
-    x_axis = list(range(min_year, min_year + len(temp_dict)))
-    y_axis = [temp_dict[datetime.date(y, 1, 1)].temperature_deviance for y in x_axis]
-    processed_data = remove_zero_data_points(x_axis, y_axis)
-    return [processed_data[0], processed_data[1]]
+    dates = sorted(temp_dict)
+    x_axis = numpy.array([date.year for date in dates])
+    y_axis = numpy.array([temp_dict[date].temperature_deviance for date in dates])
+    return remove_zero_data_points(x_axis, y_axis)
 
 
 def get_data_points_carbon(carbon_dict: Dict[datetime.date, List[CarbonEmission]], i: int) \
-        -> List[list]:
+        -> Tuple[numpy.ndarray, numpy.ndarray]:
     """Return the x and y coordinates of the carbon data points. i=0 indicates Canada, i=1 indicates
      America
 
     Preconditions:
         - i == 0 or i == 1
     """
-    min_year = min([x.year for x in carbon_dict])
-    x_axis = list(range(min_year, min_year + len(carbon_dict)))
-    y_axis = [carbon_dict[datetime.date(y, 1, 1)][i].emissions for y in x_axis]
-    processed_data = remove_zero_data_points(x_axis, y_axis)
-    return [processed_data[0], processed_data[1]]
+    dates = sorted(carbon_dict)
+    x_axis = numpy.array([date.year for date in dates])
+    y_axis = numpy.array([carbon_dict[date][i].emissions for date in dates])
+    return remove_zero_data_points(x_axis, y_axis)
+
 
+def remove_zero_data_points(x_data: numpy.ndarray, y_data: numpy.ndarray) \
+        -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Return new arrays containing x_data and y_data without the zero y values and their
+    associated x values.
 
-def remove_zero_data_points(x_data: List[int], y_data: List[float]) -> Tuple[List[int],
-                                                                             List[float]]:
-    """Remove the zero y values and the associated x values from the dataset.
     Preconditions:
         - len(x_data) == len(y_data)
-    """
-    i = 0
-    while 0 in y_data:
-        if y_data[i] == 0:
-            y_data.pop(i)
-            x_data.pop(i)
-            i -= 1
-        i += 1
 
-    return (x_data, y_data)
+    >>> x, y = remove_zero_data_points(numpy.array([1, 2, 3, 4]), numpy.array([0, 5, 0, 7]))
+    >>> x.tolist(), y.tolist()
+    ([2, 4], [5, 7])
+    """
+    non_zero = y_data != 0
+    return (x_data[non_zero], y_data[non_zero])
 
 
 if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['datetime', 'typing', 'matplotlib', 'pylab', 'pygame',
+        'extra-imports': ['datetime', 'typing', 'hashlib', 'os', 'matplotlib', 'pylab', 'pygame',
+                          'numpy', 'parse_cache',
                           'carbon_emissions', 'temperature_deviation',
-                          'wildfires', 'matplotlib.backends.backend_agg', 'python_ta.contracts'],
+                          'data', 'matplotlib.backends.backend_agg', 'python_ta.contracts'],
         # the names (strs) of imported modules
         'allowed-io': [],
         # the names (strs) of functions that call print/open/input
         'max-line-length': 100,
-        'disable': ['R1705', 'C0200']
+        'disable': ['R1705', 'C0200', 'C0415']
     })
 
     import python_ta.contracts
@@ -5,10 +5,13 @@ Contains the PlotManager class, which handles drawing plots onto the window.
 
 CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
 """
-from typing import List, Tuple
+from typing import Dict, Optional, Tuple
+import threading
+import numpy
 import pygame
 from window import Window
 from data import Data
+import analytics
 import plot
 
 
@@ -27,31 +30,58 @@ class PlotManager:
     #                    "america_vs_carbon": American wildfires vs American Carbon emissions
     #                    "canada_vs_temp": Canadian wildfires vs Temperature Deviance
     #                    "america_vs_temp": American wildfires vs Temperature Deviance
-    # - _data_points_canada_wildfire: Contains the Canadian wildfire data points, which will be
-    #                                 used to plot the Canadian wildfire data.
-    # - _data_points_america_wildfire: Contains the American wildfire data points, which will be
-    #                                 used to plot the American wildfire data.
-    # - _data_points_canada_carbon: Contains the Canadian carbon data points, which will be
-    #                                 used to plot the Canadian CO2 emissions data.
-    # - _data_points_america_carbon: Contains the American carbon data points, which will be
-    #                                used to plot the American CO2 emissions data.
-    # - _data_points_temp_deviance: Contains the temperature deviance data points, which will be
-    #                                used to plot the temperature deviance data.
+    #                    "fire_season": Canadian vs American wildfires in each month of the year
+    # - _data_points: A mapping of the name of a data series to its data points, containing
+    #                 only the series that have been computed so far. Possible names include:
+    #                 "canada_wildfire": Canadian wildfire data points
+    #                 "america_wildfire": American wildfire data points
+    #                 "canada_carbon": Canadian CO2 emissions data points
+    #                 "america_carbon": American CO2 emissions data points
+    #                 "temp_deviance": Temperature deviance data points
+    #                 "canada_monthly": Canadian wildfires per month of the year data points
+    #                 "america_monthly": American wildfires per month of the year data points
+    # - _plot_surfaces: A mapping of the name of a plot to its rendered surface, containing
+    #                   only the plots that have been rendered so far.
+    # - _render_lock: Held while rendering a plot (or computing data points), so that the
+    #                 background thread and the main thread never render at the same time.
+    # - _prerender_thread: The background thread rendering every plot ahead of time, or None
+    #                      if it has not been started.
+    # - _dirty: Whether the displayed plot changed since it was last drawn.
     # - _PLOT_POSITION: Position of the top left corner of the plot when drawn.
+    # - _PLOTS: A mapping of the name of each plot to the names of its two data series, its
+    #           two y axis labels, its title, and its x axis label.
     # Private Representation Invariants:
     # - self._plot_displayed in {"none", "canada_vs_carbon", "america_vs_carbon",
-    #                            "canada_vs_temp", "america_vs_temp"}
+    #                            "canada_vs_temp", "america_vs_temp", "fire_season"}
 
     _window: Window
     _data: Data
     _plot_surface: pygame.Surface
     _plot_displayed: str
-    _data_points_canada_wildfire: List[list]
-    _data_points_america_wildfire: List[list]
-    _data_points_canada_carbon: List[list]
-    _data_points_america_carbon: List[list]
-    _data_points_temp_deviance: List[list]
+    _data_points: Dict[str, Tuple[numpy.ndarray, numpy.ndarray]]
+    _plot_surfaces: Dict[str, pygame.Surface]
+    _render_lock: threading.Lock
+    _prerender_thread: Optional[threading.Thread]
+    _dirty: bool
     _PLOT_POSITION: Tuple[int, int] = (50, 10)
+    _PLOTS: Dict[str, Tuple[str, str, str, str, str, str]] = {
+        "canada_vs_carbon": ("canada_wildfire", "canada_carbon",
+                             'Number of Wildfires', 'Carbon Dioxide Emissions (kT)',
+                             "Canadian Wildfires vs Canadian CO2 Emissions", 'Year'),
+        "america_vs_carbon": ("america_wildfire", "america_carbon",
+                              'Number of Wildfires', 'Carbon Dioxide Emissions (kT)',
+                              "USA Wildfires vs American CO2 Emissions", 'Year'),
+        "canada_vs_temp": ("canada_wildfire", "temp_deviance",
+                           'Number of Wildfires', 'Temperature Deviance (°C)',
+                           "Canadian Wildfires vs North American Temperature Deviance", 'Year'),
+        "america_vs_temp": ("america_wildfire", "temp_deviance",
+                            'Number of Wildfires', 'Temperature Deviance (°C)',
+                            "USA Wildfires vs North American Temperature Deviance", 'Year'),
+        "fire_season": ("canada_monthly", "america_monthly",
+                        'Number of Canadian Wildfires', 'Number of USA Wildfires',
+                        "Canadian vs USA Wildfires in Each Month, 1950 Onwards",
+                        'Month')
+    }
 
     def __init__(self, window: Window, data: Data) -> None:
         """
@@ -60,22 +90,46 @@ class PlotManager:
         self._window = window
         self._plot_displayed = "none"
         self._data = data
-        self._setup_data_points()
+        self._data_points = {}
+        self._plot_surfaces = {}
+        self._render_lock = threading.Lock()
+        self._prerender_thread = None
+        self._dirty = True
 
-    def _setup_data_points(self) -> None:
+    def _get_data_points(self, series: str) -> Tuple[numpy.ndarray, numpy.ndarray]:
         """
-        Set up all of the data points by reading the data.
+        Return the data points of the data series named series, computing them by reading the
+        data if this is the first time they are needed.
+
+        Preconditions:
+         - self._render_lock is held by the caller
+         - series in {"canada_wildfire", "america_wildfire", "canada_carbon",
+                      "america_carbon", "temp_deviance", "canada_monthly", "america_monthly"}
         """
-        self._data_points_canada_wildfire = \
-            plot.get_data_points_wild_fires(self._data.wild_fires, 'Canada')
-        self._data_points_america_wildfire = \
-            plot.get_data_points_wild_fires(self._data.wild_fires, 'America')
-        self._data_points_canada_carbon = \
-            plot.get_data_points_carbon(self._data.carbon_emissions, 0)
-        self._data_points_america_carbon = \
-            plot.get_data_points_carbon(self._data.carbon_emissions, 1)
-        self._data_points_temp_deviance = \
-            plot.get_data_points_temp(self._data.temperature_deviation)
+        if series not in self._data_points:
+            if series == "canada_wildfire":
+                self._data_points[series] = \
+                    plot.get_data_points_wild_fires(self._data.wild_fire_cube, 'Canada')
+            elif series == "america_wildfire":
+                self._data_points[series] = \
+                    plot.get_data_points_wild_fires(self._data.wild_fire_cube, 'America')
+            elif series == "canada_monthly":
+                self._data_points[series] = \
+                    plot.get_data_points_wild_fires_monthly(self._data.wild_fire_cube, 'Canada')
+            elif series == "america_monthly":
+                self._data_points[series] = \
+                    plot.get_data_points_wild_fires_monthly(self._data.wild_fire_cube, 'America')
+            elif series == "canada_carbon":
+                self._data_points[series] = \
+                    plot.get_data_points_carbon(self._data.carbon_emissions, 0)
+            elif series == "america_carbon":
+                self._data_points[series] = \
+                    plot.get_data_points_carbon(self._data.carbon_emissions, 1)
+            else:
+                self._data_points[series] = \
+                    plot.get_data_points_temp(self._data.temperature_deviation)
+
+        return self._data_points[series]
 
     def set_plot(self, new_plot: str) -> None:
         """
@@ -83,35 +137,59 @@ class PlotManager:
 
         Preconditions:
          - plot in {"none", "canada_vs_carbon", "america_vs_carbon",
-                    "canada_vs_temp", "america_vs_temp"}
+                    "canada_vs_temp", "america_vs_temp", "fire_season"}
         """
 
         self._plot_displayed = new_plot
+        self._dirty = True
 
-        if new_plot == "canada_vs_carbon":
-            self._plot_surface = \
-                plot.get_plot(self._data_points_canada_wildfire,
-                              self._data_points_canada_carbon,
-                              'Number of Wildfires', 'Carbon Dioxide Emissions (kT)',
-                              "Canadian Wildfires vs Canadian CO2 Emissions")
-        elif new_plot == "america_vs_carbon":
-            self._plot_surface = \
-                plot.get_plot(self._data_points_america_wildfire,
-                              self._data_points_america_carbon,
-                              'Number of Wildfires', 'Carbon Dioxide Emissions (kT)',
-                              "USA Wildfires vs American CO2 Emissions")
-        elif new_plot == "canada_vs_temp":
-            self._plot_surface = \
-                plot.get_plot(self._data_points_canada_wildfire,
-                              self._data_points_temp_deviance,
-                              'Number of Wildfires', 'Temperature Deviance (°C)',
-                              "Canadian Wildfires vs North American Temperature Deviance")
-        elif new_plot == "america_vs_temp":
-            self._plot_surface = \
-                plot.get_plot(self._data_points_america_wildfire,
-                              self._data_points_temp_deviance,
-                              'Number of Wildfires', 'Temperature Deviance (°C)',
-                              "USA Wildfires vs North American Temperature Deviance")
+        if new_plot != "none":
+            # Rendered plots have an alpha channel; converting to the window's pixel format
+            # makes drawing the plot a plain copy instead of a blend.
+            self._plot_surface = self._get_plot_surface(new_plot).convert()
+
+    def _get_plot_surface(self, name: str) -> pygame.Surface:
+        """
+        Return the rendered surface of the plot named name, rendering it now if it has not
+        been rendered yet. If the background thread is rendering it, wait for it instead.
+
+        The plot is annotated with the correlation statistics of its two data series.
+
+        Preconditions:
+         - name in self._PLOTS
+        """
+        with self._render_lock:
+            if name not in self._plot_surfaces:
+                series1, series2, y1_label, y2_label, title, x_label = self._PLOTS[name]
+                points1 = self._get_data_points(series1)
+                points2 = self._get_data_points(series2)
+
+                # Show how strongly the two series are correlated on the plot
+                annotation = analytics.format_summary(analytics.summarize(points1, points2),
+                                                      x_label.lower(),
+                                                      ('the black line', 'the red line'))
+
+                self._plot_surfaces[name] = plot.get_plot(points1, points2, y1_label, y2_label,
+                                                          title, x_label, annotation)
+
+            return self._plot_surfaces[name]
+
+    def start_prerendering(self) -> None:
+        """
+        Start rendering every plot in a background thread, so that switching to a plot later
+        does not have to wait for it to be rendered.
+        """
+        if self._prerender_thread is None:
+            # A daemon thread does not stop the program from exiting.
+            self._prerender_thread = threading.Thread(target=self._prerender, daemon=True)
+            self._prerender_thread.start()
+
+    def _prerender(self) -> None:
+        """
+        Body of the background thread: render every plot that has not been rendered yet.
+        """
+        for name in self._PLOTS:
+            self._get_plot_surface(name)
 
     def is_plot_displayed(self) -> bool:
         """
@@ -124,17 +202,27 @@ class PlotManager:
         Draw plot, if one is supposed to be displayed.
         """
 
+        self._dirty = False
+
         if not self.is_plot_displayed():
             return
 
         self._window.draw_to_screen(self._plot_surface, self._PLOT_POSITION)
 
+    def is_dirty(self) -> bool:
+        """
+        Return whether the displayed plot (or whether a plot is displayed at all) changed
+        since a plot was last drawn.
+        """
+        return self._dirty
+
 
 if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['window', 'typing', 'data', 'plot', 'pygame', 'python_ta.contracts'],
+        'extra-imports': ['window', 'typing', 'threading', 'numpy', 'data', 'analytics', 'plot',
+                          'pygame', 'python_ta.contracts'],
         # the names (strs) of imported modules
         'allowed-io': [],
         # the names (strs) of functions that call print/open/input
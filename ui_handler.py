@@ -5,11 +5,21 @@ Contains functions for adding buttons and sliders to window, as well as managing
 CSC110 Final Project by Anatoly Zavyalov, Austin Blackman, Elliot Schrider.
 """
 
+from typing import Tuple
+import datetime
 import pygame
 from window import Window
 from firemap_updater import FireMapUpdater
 from plot_manager import PlotManager
 
+# How many days the timelapse has to move away from the timeline slider before the slider is
+# moved to follow it.
+_TIMELINE_STEP: int = 30
+
+# The range of the speed slider. The slider moves through speeds exponentially, so a value of
+# v is a speed of 2 ** v times: from 0.25x up to 64x, which plays about 8000 days per second.
+_SPEED_SLIDER_RANGE: Tuple[float, float] = (-2.0, 6.0)
+
 
 def add_buttons(window: Window, updater: FireMapUpdater, plot_manager: PlotManager) -> None:
     """Add the necessary buttons to the window, such as
@@ -22,47 +32,84 @@ def add_buttons(window: Window, updater: FireMapUpdater, plot_manager: PlotManag
     window.add_button(pygame.Rect((683 - 100, 440), (150, 50)),
                       "Restart", lambda: restart_map_animation(updater, plot_manager))
 
-    window.add_button(pygame.Rect((75, 620), (120, 50)),
+    window.add_button(pygame.Rect((40, 620), (120, 50)),
                       "View Map", lambda: plot_manager.set_plot("none"))
 
-    window.add_button(pygame.Rect((225, 620), (120, 50)),
+    window.add_button(pygame.Rect((180, 620), (120, 50)),
                       "View Plot 1", lambda: plot_manager.set_plot("canada_vs_carbon"))
 
-    window.add_button(pygame.Rect((375, 620), (120, 50)),
+    window.add_button(pygame.Rect((320, 620), (120, 50)),
                       "View Plot 2", lambda: plot_manager.set_plot("america_vs_carbon"))
 
-    window.add_button(pygame.Rect((525, 620), (120, 50)),
+    window.add_button(pygame.Rect((460, 620), (120, 50)),
                       "View Plot 3", lambda: plot_manager.set_plot("canada_vs_temp"))
 
-    window.add_button(pygame.Rect((675, 620), (120, 50)),
+    window.add_button(pygame.Rect((600, 620), (120, 50)),
                       "View Plot 4", lambda: plot_manager.set_plot("america_vs_temp"))
 
+    window.add_button(pygame.Rect((740, 620), (120, 50)),
+                      "View Plot 5", lambda: plot_manager.set_plot("fire_season"))
+
 
-def add_sliders(window: Window) -> None:
+def add_sliders(window: Window, updater: FireMapUpdater) -> None:
     """
-    Add the necessary sliders to the window.
+    Add the necessary sliders to the window, such as the timeline slider, which covers
+    every date of the timelapse.
     """
     window.add_slider(rect=pygame.Rect((375, 550), (150, 25)), label="speed",
-                      start_value=1, value_range=(0.25, 6))
+                      start_value=0.0, value_range=_SPEED_SLIDER_RANGE)
+
+    first_date, last_date = updater.get_date_range()
+    window.add_slider(rect=pygame.Rect((68, 550), (275, 25)), label="timeline",
+                      start_value=updater.get_date().toordinal(),
+                      value_range=(first_date.toordinal(), last_date.toordinal()))
 
 
 def update_sliders(window: Window, updater: FireMapUpdater) -> None:
     """
     Update fire map based on slider values.
 
+    If the user moved the timeline slider, seek the timelapse to the slider's date.
+    Otherwise, move the timeline slider to follow the timelapse. The slider is only moved
+    once the timelapse is _TIMELINE_STEP days away from it, so the whole window does not
+    need to be redrawn every frame.
+
     Preconditions:
      - window has a slider "speed"
+     - window has a slider "timeline"
     """
-    updater.set_animation_speed(window.get_slider_value("speed"))
+    updater.set_animation_speed(get_speed(window))
+
+    timeline_day = int(window.get_slider_value("timeline"))
+
+    if window.was_slider_moved("timeline"):
+        updater.seek(datetime.date.fromordinal(timeline_day))
+    elif abs(updater.get_date().toordinal() - timeline_day) >= _TIMELINE_STEP:
+        window.set_slider_value("timeline", updater.get_date().toordinal())
+
+
+def get_speed(window: Window) -> float:
+    """
+    Return the timelapse speed (multiplier) chosen on the speed slider.
+
+    Preconditions:
+     - window has a slider "speed"
+    """
+    return 2 ** window.get_slider_value("speed")
 
 
 def draw_ui_text(window: Window) -> None:
     """
-    Render the UI text, such as the slider label and animation speed.
+    Render the UI text, such as the slider labels and animation speed.
     """
 
     window.draw_to_screen(window.render_text(
-        f"Timelapse Speed: {round(window.get_slider_value('speed'), 1)}x",
+        "Timeline", True, pygame.Color(255, 255, 255),
+        pygame.Color(window.BACKGROUND_COLOR[0], window.BACKGROUND_COLOR[1],
+                     window.BACKGROUND_COLOR[2])), (68, 520))
+
+    window.draw_to_screen(window.render_text(
+        f"Timelapse Speed: {round(get_speed(window), 2)}x",
         True, pygame.Color(255, 255, 255),
         pygame.Color(window.BACKGROUND_COLOR[0], window.BACKGROUND_COLOR[1],
                      window.BACKGROUND_COLOR[2])), (335, 520))
@@ -99,8 +146,8 @@ if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['window', 'firemap_updater', 'pygame', 'plot_manager',
-                          'python_ta.contracts'],
+        'extra-imports': ['window', 'firemap_updater', 'pygame', 'plot_manager', 'datetime',
+                          'typing', 'python_ta.contracts'],
         # the names (strs) of imported modules
         'allowed-io': [],
         # the names (strs) of functions that call print/open/input
@@ -40,6 +40,20 @@ class Window:
     # - _clock: pygame.time.Clock instance, used for updating GUI
     # - _time_delta: the time delta in milliseconds for this update
     # - _font: PyGame font instance, used for rendering text.
+    # - _dirty: Whether something on the window changed, so the next frame has to be drawn
+    #           and displayed. If not, the screen is left as it is.
+    # - _dirty_rects: Areas of the screen that were redrawn in this frame. If the window is
+    #                 not dirty, only these areas of the display are updated.
+    # - _idle_frames: The number of frames in a row that were not dirty and had no dirty
+    #                 areas.
+    # - _slider_values: The value of each slider when it was last checked, used to notice
+    #                   when a slider is moved.
+    # - _moved_sliders: The labels of the sliders that were moved by the user in the last
+    #                   update.
+    # - _FPS: The maximum number of frames per second while the window is active.
+    # - _IDLE_FPS: The maximum number of frames per second once the window is idle.
+    # - _IDLE_AFTER_FRAMES: The number of frames in a row that must not be dirty before the
+    #                       window is considered idle.
 
     # Private Representation Invariants:
     # - self._width > 0
@@ -61,6 +75,16 @@ class Window:
     _background_surface: pygame.Surface
     _font: pygame.font.Font
 
+    _dirty: bool
+    _dirty_rects: List[pygame.Rect]
+    _idle_frames: int
+    _slider_values: Dict[str, float]
+    _moved_sliders: List[str]
+
+    _FPS: int = 60
+    _IDLE_FPS: int = 10
+    _IDLE_AFTER_FRAMES: int = 30
+
     BACKGROUND_COLOR: Tuple[int, int, int] = (20, 20, 30)
 
     def __init__(self) -> None:
@@ -73,6 +97,13 @@ class Window:
         self._title = "Wildfire Thing!"
         self._buttons = []
         self._sliders = {}
+        self._slider_values = {}
+        self._moved_sliders = []
+
+        # The first frame always has to be drawn.
+        self._dirty = True
+        self._dirty_rects = []
+        self._idle_frames = 0
 
         # Initialize Pygame stuff
         self._screen = pygame.display.set_mode((self._width, self._height))
@@ -104,10 +135,24 @@ class Window:
         self.draw_to_screen(self._background_surface, (0, 0))
 
     def update(self) -> None:
-        """Window loop body."""
+        """Window loop body.
+
+        The whole display is only updated if the window is dirty. Otherwise, only the dirty
+        areas of the display are updated, since nothing else on it has changed.
+        """
 
         # Update Pygame Display
-        pygame.display.flip()
+        if self._dirty:
+            pygame.display.flip()
+            self._idle_frames = 0
+        elif self._dirty_rects:
+            pygame.display.update(self._dirty_rects)
+            self._idle_frames = 0
+        else:
+            self._idle_frames += 1
+
+        self._dirty = False
+        self._dirty_rects = []
 
         # Handle window events
         self._handle_events()
@@ -115,6 +160,33 @@ class Window:
         # Update GUI manager (time takes seconds and not ms, so divide by 1000)
         self._gui_manager.update(self._time_delta / 1000.0)
 
+        # Moving a slider changes the UI, including the text that shows its value.
+        self._moved_sliders = []
+        for label, slider in self._sliders.items():
+            if slider.get_current_value() != self._slider_values[label]:
+                self._slider_values[label] = slider.get_current_value()
+                self._moved_sliders.append(label)
+                self._dirty = True
+
+    def mark_dirty(self) -> None:
+        """
+        Mark the window as dirty, so the next frame is drawn and displayed.
+        """
+        self._dirty = True
+
+    def add_dirty_rect(self, rect: pygame.Rect) -> None:
+        """
+        Mark an area of the screen as redrawn, so it is updated on the display even if the
+        window is not dirty.
+        """
+        self._dirty_rects.append(rect)
+
+    def is_dirty(self) -> bool:
+        """
+        Return whether the window is dirty, meaning the next frame has to be drawn.
+        """
+        return self._dirty
+
     def draw_ui(self) -> None:
         """Draw the buttons and sliders and so on."""
         # Draw UI
@@ -125,6 +197,10 @@ class Window:
 
         for event in pygame.event.get():
 
+            # Any event (mouse movement, clicks, the window being exposed, ...) may change
+            # what the window looks like.
+            self._dirty = True
+
             # If window is to be closed
             if event.type == pygame.QUIT:
                 self._running = False
@@ -176,6 +252,8 @@ class Window:
                                                   start_value=start_value,
                                                   value_range=value_range,
                                                   manager=self._gui_manager)
+        self._slider_values[label] = self._sliders[label].get_current_value()
+        self._dirty = True
 
     def get_slider_value(self, label: str) -> float:
         """
@@ -186,6 +264,30 @@ class Window:
         """
         return self._sliders[label].get_current_value()
 
+    def set_slider_value(self, label: str, value: float) -> None:
+        """
+        Move the slider corresponding to label to value. This does not count as the user
+        moving the slider.
+
+        Preconditions:
+         - label in self._sliders
+        """
+        slider = self._sliders[label]
+
+        if value != slider.get_current_value():
+            slider.set_current_value(value)
+            self._slider_values[label] = slider.get_current_value()
+            self._dirty = True
+
+    def was_slider_moved(self, label: str) -> bool:
+        """
+        Return whether the user moved the slider corresponding to label in the last update.
+
+        Preconditions:
+         - label in self._sliders
+        """
+        return label in self._moved_sliders
+
     def is_running(self) -> bool:
         """
         Return whether window is running.
@@ -198,17 +300,24 @@ class Window:
         """
         return self._screen
 
-    def draw_to_screen(self, surface: pygame.Surface, position: Tuple[int, int]) -> None:
+    def draw_to_screen(self, surface: pygame.Surface, position: Tuple[int, int]) -> pygame.Rect:
         """
-        Draw surface at position onto self._screen.
+        Draw surface at position onto self._screen, and return the area of the screen
+        that was drawn over.
         """
-        self._screen.blit(surface, position)
+        return self._screen.blit(surface, position)
 
     def update_clock(self) -> None:
         """
         Update the clock and set self._time_delta to be the time delta in milliseconds.
+
+        Once the window has been idle for a while, the frame rate is lowered, so the window
+        loop uses almost no CPU while nothing is changing.
         """
-        self._time_delta = self._clock.tick(60)
+        if self._idle_frames < self._IDLE_AFTER_FRAMES:
+            self._time_delta = self._clock.tick(self._FPS)
+        else:
+            self._time_delta = self._clock.tick(self._IDLE_FPS)
 
     def get_delta(self) -> float:
         """